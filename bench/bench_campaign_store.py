@@ -0,0 +1,84 @@
+# bench/bench_campaign_store.py
+"""
+Campaign store benchmark: sessions resumed per second and rows written per turn.
+
+Usage:
+  python bench/bench_campaign_store.py [--sessions 2000] [--turns 20000]
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game.campaign_store import CampaignHost, CampaignStore  # noqa: E402
+from game.yaml_scenario import YamlScenario  # noqa: E402
+
+
+COMMANDS = ["look", "search", "move hall", "move foyer", "move library", "move cellar",
+            "move fork", "move echo", "move loop", "move hollow", "status"]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--scenario-dir", default="dev/scenario_maze")
+    p.add_argument("--sessions", type=int, default=2000)
+    p.add_argument("--turns", type=int, default=20000)
+    p.add_argument("--loaded", type=int, default=128)
+    p.add_argument("--batch", type=int, default=64)
+    args = p.parse_args()
+
+    random.seed(1)
+    scenarios = {}
+
+    def factory(scenario_dir: str) -> YamlScenario:
+        if scenario_dir not in scenarios:
+            scenarios[scenario_dir] = YamlScenario(scenario_dir)
+        return scenarios[scenario_dir]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "campaigns.sqlite3")
+        store = CampaignStore(db, batch_turns=args.batch)
+        host = CampaignHost(store, factory, max_loaded=args.loaded)
+
+        t0 = time.perf_counter()
+        for i in range(args.sessions):
+            host.create(f"s{i:06d}", args.scenario_dir)
+        host.park_all()
+        created = time.perf_counter() - t0
+        print(f"created+parked {args.sessions} sessions in {created:.2f}s")
+
+        # cold resume: every session loaded from disk exactly once
+        t0 = time.perf_counter()
+        for i in range(args.sessions):
+            host.engine(f"s{i:06d}")
+        resumed = time.perf_counter() - t0
+        host.park_all()
+        print(f"resumed {args.sessions / resumed:,.0f} sessions/s")
+
+        # random play across all sessions with a bounded working set
+        rows_before = store.rows_written
+        t0 = time.perf_counter()
+        for _ in range(args.turns):
+            sid = f"s{random.randrange(args.sessions):06d}"
+            if not host.engine(sid).state.active:
+                continue
+            host.process_command(sid, random.choice(COMMANDS))
+        host.park_all()
+        store.flush()
+        played = time.perf_counter() - t0
+
+        turns = max(1, store.turns_recorded)
+        print(f"played {args.turns} commands in {played:.2f}s ({args.turns / played:,.0f}/s)")
+        print(f"rows written per turn: {(store.rows_written - rows_before) / turns:.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench/bench_realtime.py
+"""
+Real-time scheduler benchmark: tick jitter with many players and timers
+while commands are processed on the same event loop.
+
+Usage:
+  python bench/bench_realtime.py [--players 200] [--timers 5000] [--seconds 10]
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game.engine import GameEngine  # noqa: E402
+from game.entities import Player  # noqa: E402
+from game.game_state import GameState  # noqa: E402
+from game.realtime import RealtimeConfig, RealtimeScheduler, ScriptedTimer  # noqa: E402
+from game.yaml_scenario import YamlScenario  # noqa: E402
+
+
+COMMANDS = ["look", "search", "move hall", "move foyer", "move fork", "move echo", "status"]
+
+
+async def play(engine: GameEngine, rate: float) -> int:
+    """
+    Feed random commands at roughly `rate` per second until the game ends.
+    """
+    state = engine.state
+    pids = list(state.players)
+    done = 0
+    while state.active:
+        engine.process_command(random.choice(pids), random.choice(COMMANDS))
+        state.messages.clear()
+        done += 1
+        await asyncio.sleep(1.0 / rate)
+    return done
+
+
+async def run(args: argparse.Namespace) -> None:
+    players = {
+        f"P{i + 1}": Player(id=f"P{i + 1}", name=f"Player {i + 1}", location_id="",
+                            health=10 ** 9, sanity=10 ** 9)
+        for i in range(args.players)
+    }
+    state = GameState(world=None, players=players, turn_order=list(players))  # type: ignore[arg-type]
+    engine = GameEngine(state, YamlScenario(args.scenario_dir))
+
+    timers = tuple(
+        ScriptedTimer(after=random.uniform(0.1, 5.0), every=random.uniform(0.5, 5.0))
+        for _ in range(args.timers)
+    )
+    config = RealtimeConfig(tick=args.tick, ambient_every=1.0, sanity_decay_every=2.0, timers=timers)
+    scheduler = RealtimeScheduler(engine, config, on_messages=state.messages.clear, rng=random.Random(1))
+
+    ticker = asyncio.create_task(scheduler.run())
+    player = asyncio.create_task(play(engine, args.rate))
+
+    t0 = time.perf_counter()
+    await asyncio.sleep(args.seconds)
+    state.active = False
+    commands = await player
+    await ticker
+    elapsed = time.perf_counter() - t0
+
+    wheels = [scheduler.world_wheel, *scheduler.wheels.values()]
+    print(f"{args.players} players, {sum(w.pending for w in wheels)} pending timers, tick {args.tick * 1000:.0f} ms")
+    print(f"processed {commands} commands in {elapsed:.1f}s")
+    print(scheduler.jitter.report())
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--scenario-dir", default="dev/scenario_maze")
+    p.add_argument("--players", type=int, default=200)
+    p.add_argument("--timers", type=int, default=5000)
+    p.add_argument("--tick", type=float, default=0.05)
+    p.add_argument("--rate", type=float, default=500.0, help="Commands per second")
+    p.add_argument("--seconds", type=float, default=10.0)
+    args = p.parse_args()
+
+    random.seed(1)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
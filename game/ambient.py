@@ -0,0 +1,190 @@
+# game/ambient.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import random
+
+
+@dataclass(frozen=True)
+class AmbientEvent:
+    message: str = ""
+    health: int = 0
+    sanity: int = 0
+    # (item tag, health delta, sanity delta) applied if the player carries the tag
+    modifiers: Tuple[Tuple[str, int, int], ...] = ()
+
+    @property
+    def is_quiet(self) -> bool:
+        return not self.message and not self.health and not self.sanity
+
+    def effect_for(self, tags: Set[str]) -> Tuple[int, int]:
+        """
+        Health/sanity deltas for a player carrying items with `tags`.
+        Modifiers soften or sharpen an effect but never flip its sign,
+        so a lantern can cancel sanity loss but not turn it into a gain.
+        """
+        health, sanity = self.health, self.sanity
+        for tag, dh, ds in self.modifiers:
+            if tag in tags:
+                health = _adjust(self.health, health, dh)
+                sanity = _adjust(self.sanity, sanity, ds)
+        return health, sanity
+
+
+def _adjust(base: int, current: int, delta: int) -> int:
+    value = current + delta
+    if base < 0:
+        return min(0, value)
+    if base > 0:
+        return max(0, value)
+    return current
+
+
+class AliasTable:
+    """
+    Weighted event table compiled with Vose's alias method:
+    O(n) to build, O(1) per draw regardless of table size.
+    """
+
+    def __init__(self, events: Sequence[AmbientEvent], weights: Sequence[float]) -> None:
+        if not events or len(events) != len(weights):
+            raise ValueError("ambient table needs one weight per event and at least one event")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("ambient weights must be non-negative with a positive total")
+
+        n = len(events)
+        self.events: Tuple[AmbientEvent, ...] = tuple(events)
+        self._prob: List[float] = [0.0] * n
+        self._alias: List[int] = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+
+        # leftovers are 1.0 up to float error
+        for i in large + small:
+            self._prob[i] = 1.0
+            self._alias[i] = i
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def sample(self, rng: Optional[random.Random] = None) -> AmbientEvent:
+        u = (rng or random).random() * len(self._prob)
+        i = int(u)
+        if u - i < self._prob[i]:
+            return self.events[i]
+        return self.events[self._alias[i]]
+
+    def sample_many(self, count: int, rng: Optional[random.Random] = None) -> List[AmbientEvent]:
+        """
+        Draw `count` events in one call, for bulk pacing simulations.
+        """
+        draw = (rng or random).random
+        n = len(self._prob)
+        prob, alias, events = self._prob, self._alias, self.events
+        out: List[AmbientEvent] = []
+        append = out.append
+        for _ in range(count):
+            u = draw() * n
+            i = int(u)
+            append(events[i] if u - i < prob[i] else events[alias[i]])
+        return out
+
+    def expected_effects(self) -> Tuple[float, float]:
+        """
+        Mean (health, sanity) change per draw, ignoring item modifiers.
+        """
+        n = len(self._prob)
+        mass = [0.0] * n
+        for i, p in enumerate(self._prob):
+            mass[i] += p / n
+            mass[self._alias[i]] += (1.0 - p) / n
+        health = sum(m * e.health for m, e in zip(mass, self.events))
+        sanity = sum(m * e.sanity for m, e in zip(mass, self.events))
+        return health, sanity
+
+
+# The original hard-coded ladder: 20% noise, 15% sanity chip, 10% health chip.
+DEFAULT_AMBIENT = AliasTable(
+    [
+        AmbientEvent(message="Something moves just out of sight. The air feels heavier."),
+        AmbientEvent(message="A whisper curls into your ear in a voice you almost recognize.", sanity=-1),
+        AmbientEvent(message="A sudden, invisible weight presses on your chest. It hurts to breathe.", health=-1),
+        AmbientEvent(),
+    ],
+    [0.20, 0.15, 0.10, 0.55],
+)
+
+
+def parse_ambient_table(raw: Any, where: str) -> AliasTable:
+    """
+    Compile a YAML ambient list into an AliasTable. Each entry:
+
+      - weight: 3
+        message: "A whisper..."
+        health: 0
+        sanity: -1
+        modifiers:
+          light: { sanity: 1 }
+    """
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"{where}: 'ambient' must be a non-empty list")
+
+    events: List[AmbientEvent] = []
+    weights: List[float] = []
+    for entry in raw:
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: each ambient event must be a mapping")
+
+        mods_raw = entry.get("modifiers", {})
+        if mods_raw is None:
+            mods_raw = {}
+        if not isinstance(mods_raw, dict):
+            raise ValueError(f"{where}: ambient 'modifiers' must be a mapping of tag -> effects")
+        modifiers = []
+        for tag, eff in mods_raw.items():
+            eff = _effects(eff, where)
+            try:
+                modifiers.append((str(tag), int(eff.get("health", 0)), int(eff.get("sanity", 0))))
+            except (TypeError, ValueError):
+                raise ValueError(f"{where}: ambient modifier '{tag}' effects must be integers") from None
+
+        try:
+            weight = float(entry.get("weight", 1))
+            event = AmbientEvent(
+                message=str(entry.get("message", "")).strip(),
+                health=int(entry.get("health", 0)),
+                sanity=int(entry.get("sanity", 0)),
+                modifiers=tuple(modifiers),
+            )
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: ambient weight/health/sanity must be numbers") from None
+        events.append(event)
+        weights.append(weight)
+
+    try:
+        return AliasTable(events, weights)
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+
+
+def _effects(raw: Any, where: str) -> Dict[str, Any]:
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where}: each ambient modifier must map to {{health, sanity}}")
+    return raw
+
+
+def carried_tags(items: Iterable[Any]) -> Set[str]:
+    return {tag for item in items for tag in item.tags}
@@ -0,0 +1,399 @@
+# game/analysis.py
+"""
+Exact pacing analytics for a scenario's room graph.
+
+Players are modelled as random walkers: each turn the moving player
+either stays put (probability `stay`, i.e. spends the turn on look,
+search, use...) or takes one of the room's exits uniformly at random.
+After the move the room's ambient table is applied as a per-turn death
+probability, then the win condition is checked -- the same order as
+GameEngine.end_of_turn.
+
+Ambient health loss is not memoryless (a player dies after losing all
+health, not on a single roll), so the per-turn death probability of a
+room is approximated geometrically as
+
+    hazard = expected health lost per turn / starting health
+
+Expected turns and the chance of dying first are then obtained by
+solving the absorbing-chain equations (I - Q) x = b.
+
+Usage:
+  python -m game.analysis --scenario maze
+  python -m game.analysis --scenario manor --hazard 0.02
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import math
+import os
+
+from .ambient import DEFAULT_AMBIENT
+from .entities import Player
+from .game_state import GameState
+from .scenario import Scenario
+from .world import World
+
+try:
+    import numpy as np  # type: ignore
+except Exception as e:  # pragma: no cover
+    np = None
+    _numpy_import_error = e
+
+try:
+    import scipy.sparse as sp  # type: ignore
+    import scipy.sparse.linalg as spla  # type: ignore
+except Exception:  # pragma: no cover
+    sp = None
+    spla = None
+
+
+# Largest system solved with dense numpy when scipy is unavailable.
+DENSE_LIMIT = 4000
+# Largest system factorized directly. Room graphs with cycles suffer LU
+# fill-in well before this grows large (10k rooms: ~20 s direct vs 0.1 s
+# iterative), so anything bigger uses BiCGSTAB.
+DIRECT_LIMIT = 1_500
+# Meet mode solves over (P1 room, P2 room, whose turn): 2 * n^2 states.
+MEET_STATE_LIMIT = 2_000_000
+
+
+@dataclass(frozen=True)
+class StartResult:
+    start: str
+    expected_turns: float   # player turns until the game ends (win or death)
+    p_win: float
+    p_death: float
+
+
+def _require_numpy() -> None:
+    if np is None:  # pragma: no cover
+        raise RuntimeError(
+            "NumPy is required for analysis. Install it with: pip install numpy scipy"
+        ) from _numpy_import_error
+
+
+class RoomGraph:
+    """
+    Dense integer view of a World: room ids -> 0..n-1, exit edge arrays,
+    and a per-room hazard vector.
+    """
+
+    def __init__(self, world: World, hazard: Sequence[float]) -> None:
+        _require_numpy()
+        self.ids: List[str] = sorted(world.locations)
+        self.index: Dict[str, int] = {rid: i for i, rid in enumerate(self.ids)}
+
+        src: List[int] = []
+        dst: List[int] = []
+        for rid in self.ids:
+            i = self.index[rid]
+            for nid in sorted(world.locations[rid].neighbors):
+                if nid in self.index:
+                    src.append(i)
+                    dst.append(self.index[nid])
+
+        self.n = len(self.ids)
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.hazard = np.clip(np.asarray(hazard, dtype=np.float64), 0.0, 1.0)
+
+    def move_edges(self, stay: float) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        (from, to, probability) for one move, including the stay-put option.
+        Rooms without exits always stay.
+        """
+        deg = np.bincount(self.src, minlength=self.n).astype(np.float64)
+        move_p = (1.0 - stay) / np.maximum(deg[self.src], 1.0)
+
+        stay_p = np.where(deg > 0, stay, 1.0)
+        rooms = np.arange(self.n, dtype=np.int64)
+        keep = stay_p > 0
+
+        frm = np.concatenate([self.src, rooms[keep]])
+        to = np.concatenate([self.dst, rooms[keep]])
+        p = np.concatenate([move_p, stay_p[keep]])
+        return frm, to, p
+
+
+def room_hazards(world: World, scenario: Scenario, start_health: int = 10) -> Dict[str, float]:
+    """
+    Geometric per-turn death probability from each room's ambient table.
+    """
+    out: Dict[str, float] = {}
+    for rid in world.locations:
+        table = scenario.ambient_table(rid) or DEFAULT_AMBIENT
+        health, _ = table.expected_effects()
+        out[rid] = min(1.0, max(0.0, -health) / max(1, start_health))
+    return out
+
+
+def _solve(n: int, rows, cols, vals, rhs: "np.ndarray") -> "np.ndarray":
+    """
+    Solve (I - Q) X = rhs where Q is given in COO form. rhs is 2-D.
+    """
+    if sp is None:
+        if n > DENSE_LIMIT:
+            raise RuntimeError(
+                f"{n} states is too many for a dense solve; install scipy for sparse solving"
+            )
+        a = np.identity(n)
+        np.subtract.at(a, (rows, cols), vals)
+        return np.linalg.solve(a, rhs)
+
+    q = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
+    a = sp.identity(n, format="csr") - q
+    if n <= DIRECT_LIMIT:
+        x = spla.spsolve(a.tocsc(), rhs)
+        return np.asarray(x).reshape(rhs.shape)
+
+    maxiter = 100 * int(math.sqrt(n)) + 1000
+    out = np.empty_like(rhs)
+    precond = None
+    for j in range(rhs.shape[1]):
+        x, info = spla.bicgstab(a, rhs[:, j], rtol=1e-10, maxiter=maxiter, M=precond)
+        if info != 0 and precond is None:
+            # slow-mixing chains: retry with an incomplete-LU preconditioner
+            ilu = spla.spilu(a.tocsc(), drop_tol=1e-5, fill_factor=10)
+            precond = spla.LinearOperator(a.shape, ilu.solve)
+            x, info = spla.bicgstab(a, rhs[:, j], rtol=1e-10, maxiter=maxiter, M=precond)
+        if info != 0:
+            raise RuntimeError(f"iterative solve did not converge (info={info})")
+        out[:, j] = x
+    return out
+
+
+def _can_reach(n: int, rows, cols, vals, seed: "np.ndarray") -> "np.ndarray":
+    """
+    Mask of states with a positive-probability path into `seed`
+    (frontier BFS over the reversed transition graph).
+    """
+    live = vals > 0
+    rows, cols = rows[live], cols[live]
+    order = np.argsort(cols, kind="stable")
+    preds = rows[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cols, minlength=n), out=indptr[1:])
+
+    mask = seed.copy()
+    frontier = np.flatnonzero(mask)
+    while frontier.size:
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        cand = preds[offsets]
+        cand = np.unique(cand[~mask[cand]])
+        mask[cand] = True
+        frontier = cand
+    return mask
+
+
+def _absorbing_chain(n: int, rows, cols, vals, win: "np.ndarray", death: "np.ndarray"):
+    """
+    Expected steps, P(win) and P(death) for every transient state.
+
+    States that can never absorb (e.g. a hazard-free component without the
+    target) are left out of the solve; anything that can drift into them
+    has an infinite expected time.
+    """
+    can = _can_reach(n, rows, cols, vals, (win + death) > 0)
+    doomed = _can_reach(n, rows, cols, vals, ~can)
+
+    m = int(can.sum())
+    steps = np.full(n, math.inf)
+    p_win = np.zeros(n)
+    p_death = np.zeros(n)
+    if m == 0:
+        return steps, p_win, p_death
+
+    idx = np.full(n, -1, dtype=np.int64)
+    idx[can] = np.arange(m)
+    keep = can[rows] & can[cols]
+
+    # With no traps every walk ends, so P(death) = 1 - P(win) for free.
+    if doomed.any():
+        rhs = np.column_stack([np.ones(m), win[can], death[can]])
+    else:
+        rhs = np.column_stack([np.ones(m), win[can]])
+    x = _solve(m, idx[rows[keep]], idx[cols[keep]], vals[keep], rhs)
+
+    steps[can] = x[:, 0]
+    steps[doomed] = math.inf
+    p_win[can] = x[:, 1]
+    p_death[can] = x[:, 2] if x.shape[1] > 2 else 1.0 - x[:, 1]
+    return steps, p_win, p_death
+
+
+def analyze_reach(graph: RoomGraph, target: str, stay: float = 0.0) -> List[StartResult]:
+    """
+    One walker trying to reach `target`, reported for every start room.
+    """
+    if target not in graph.index:
+        raise ValueError(f"reach target '{target}' is not a room in this scenario")
+    t = graph.index[target]
+    h = graph.hazard
+
+    frm, to, p = graph.move_edges(stay)
+    survive = p * (1.0 - h[to])
+
+    win = np.bincount(frm[to == t], weights=survive[to == t], minlength=graph.n)
+    death = np.bincount(frm, weights=p * h[to], minlength=graph.n)
+
+    inner = (to != t) & (frm != t)
+    steps, p_win, p_death = _absorbing_chain(graph.n, frm[inner], to[inner], survive[inner], win, death)
+
+    results = []
+    for i, rid in enumerate(graph.ids):
+        if i == t:
+            results.append(StartResult(rid, 0.0, 1.0, 0.0))
+        else:
+            results.append(StartResult(rid, float(steps[i]), float(p_win[i]), float(p_death[i])))
+    return results
+
+
+def analyze_meet(graph: RoomGraph, p2_start: str, stay: float = 0.0) -> List[StartResult]:
+    """
+    Two walkers taking alternating turns (P1 first) until they share a room.
+    Solved on the product chain (P1 room, P2 room, whose turn); reported for
+    every P1 start room with P2 at `p2_start`.
+    """
+    n = graph.n
+    size = 2 * n * n
+    if size > MEET_STATE_LIMIT:
+        raise ValueError(
+            f"meet analysis needs {size:,} joint states (limit {MEET_STATE_LIMIT:,}); "
+            "the product chain grows with rooms squared"
+        )
+    if p2_start not in graph.index:
+        raise ValueError(f"P2 start '{p2_start}' is not a room in this scenario")
+    h = graph.hazard
+
+    frm, to, p = graph.move_edges(stay)
+    e = len(frm)
+
+    def state(turn, a, b):
+        return (turn * n + a) * n + b
+
+    # Every (edge, waiting room) pair, for whichever player is moving.
+    mover_from = np.repeat(frm, n)
+    mover_to = np.repeat(to, n)
+    waiting = np.tile(np.arange(n, dtype=np.int64), e)
+    step_p = np.repeat(p * (1.0 - h[to]), n)
+    die_p = np.repeat(p * h[to], n)
+
+    valid = mover_from != waiting
+    meet = valid & (mover_to == waiting)
+    move = valid & ~meet
+
+    rows_l, cols_l, vals_l = [], [], []
+    win = np.zeros(size)
+    death = np.zeros(size)
+
+    # turn 0: P1 moves a -> a' while P2 waits in b
+    # turn 1: P2 moves b -> b' while P1 waits in a
+    for turn in (0, 1):
+        if turn == 0:
+            s = state(0, mover_from, waiting)
+            nxt = state(1, mover_to, waiting)
+        else:
+            s = state(1, waiting, mover_from)
+            nxt = state(0, waiting, mover_to)
+
+        np.add.at(death, s[valid], die_p[valid])
+        np.add.at(win, s[meet], step_p[meet])
+        rows_l.append(s[move])
+        cols_l.append(nxt[move])
+        vals_l.append(step_p[move])
+
+    rows = np.concatenate(rows_l)
+    cols = np.concatenate(cols_l)
+    vals = np.concatenate(vals_l)
+    steps, p_win, p_death = _absorbing_chain(size, rows, cols, vals, win, death)
+
+    b = graph.index[p2_start]
+    results = []
+    for a, rid in enumerate(graph.ids):
+        if a == b:
+            results.append(StartResult(rid, 0.0, 1.0, 0.0))
+            continue
+        s = state(0, a, b)
+        results.append(StartResult(rid, float(steps[s]), float(p_win[s]), float(p_death[s])))
+    return results
+
+
+def load_scenario_world(scenario: Scenario, player_ids: Sequence[str] = ("P1", "P2")) -> GameState:
+    players = {pid: Player(id=pid, name=pid, location_id="") for pid in player_ids}
+    state = GameState(world=None, players=players, turn_order=list(player_ids))  # type: ignore[arg-type]
+    scenario.initial_setup(state)
+    state.messages.clear()
+    return state
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from .scenario_catalog import ScenarioCatalog, catalog_roots
+    from .regional_scenario import RegionalWorld, open_scenario
+
+    p = argparse.ArgumentParser(prog="python -m game.analysis", description=__doc__.split("\n\n")[0])
+    p.add_argument("--scenario", default=os.environ.get("SCENARIO", "manor"))
+    p.add_argument("--scenario-dir", default=os.environ.get("SCENARIO_DIR"))
+    p.add_argument("--scenario-root", action="append", default=[])
+    p.add_argument("--mode", default=None, help="Override the scenario mode (meet | reach:<room_id>)")
+    p.add_argument("--stay", type=float, default=0.0, help="Chance a turn is spent without moving")
+    p.add_argument("--hazard", type=float, default=None, help="Per-turn death chance for every room")
+    p.add_argument("--top", type=int, default=0, help="Only print the N slowest start rooms")
+    args = p.parse_args(argv)
+
+    scenario_dir = args.scenario_dir
+    if scenario_dir is None:
+        entry = ScenarioCatalog(catalog_roots(args.scenario_root)).resolve(args.scenario)
+        scenario_dir = entry.path if entry is not None else f"dev/scenario_{args.scenario}"
+
+    scenario = open_scenario(scenario_dir)
+    state = load_scenario_world(scenario)
+    world = state.world
+    if isinstance(world, RegionalWorld):
+        # the chains need every room, not just the starting regions
+        world.load_all()
+
+    if args.hazard is not None:
+        hazards = {rid: args.hazard for rid in world.locations}
+    else:
+        hazards = room_hazards(world, scenario)
+
+    graph = RoomGraph(world, [hazards[rid] for rid in sorted(world.locations)])
+    mode = args.mode or scenario.mode
+
+    if mode == "meet":
+        p2_start = state.players["P2"].location_id
+        results = analyze_meet(graph, p2_start, stay=args.stay)
+        header = f"meet: P1 start room vs P2 fixed at '{p2_start}' (turns = both players' turns)"
+        configured = state.players["P1"].location_id
+    elif mode.startswith("reach:"):
+        target = mode.split(":", 1)[1].strip()
+        results = analyze_reach(graph, target, stay=args.stay)
+        header = f"reach:{target}: single player, turns = that player's turns"
+        configured = None
+    else:
+        raise SystemExit(f"Mode '{mode}' has no analysis")
+
+    print(f"Scenario: {scenario.name} ({graph.n} rooms)")
+    print(header)
+    print()
+    print(f"  {'start':<20} {'E[turns]':>10} {'P(win)':>8} {'P(death)':>9}")
+
+    rows = sorted(results, key=lambda r: r.expected_turns, reverse=True)
+    if args.top:
+        rows = rows[: args.top]
+    for r in rows:
+        mark = " *" if r.start == configured else ""
+        turns = f"{r.expected_turns:10.1f}" if math.isfinite(r.expected_turns) else f"{'never':>10}"
+        print(f"  {r.start:<20} {turns} {r.p_win:8.3f} {r.p_death:9.3f}{mark}")
+
+
+if __name__ == "__main__":
+    main()
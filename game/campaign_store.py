@@ -0,0 +1,522 @@
+# game/campaign_store.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import queue
+import sqlite3
+import threading
+import time
+
+from .engine import GameEngine
+from .entities import Item, Player
+from .game_state import GameState
+from .scenario import Scenario
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id         TEXT PRIMARY KEY,
+    scenario_dir       TEXT NOT NULL,
+    turn_number        INTEGER NOT NULL,
+    current_turn_index INTEGER NOT NULL,
+    active             INTEGER NOT NULL,
+    winner_id          TEXT,
+    updated_at         REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    session_id  TEXT NOT NULL,
+    player_id   TEXT NOT NULL,
+    turn_slot   INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    health      INTEGER NOT NULL,
+    sanity      INTEGER NOT NULL,
+    PRIMARY KEY (session_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inventory (
+    session_id TEXT NOT NULL,
+    player_id  TEXT NOT NULL,
+    slot       INTEGER NOT NULL,
+    item_id    TEXT NOT NULL,
+    PRIMARY KEY (session_id, player_id, slot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS item_locations (
+    session_id TEXT NOT NULL,
+    item_id    TEXT NOT NULL,
+    room_id    TEXT NOT NULL,
+    slot       INTEGER NOT NULL,
+    PRIMARY KEY (session_id, item_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS inspected_rooms (
+    session_id TEXT NOT NULL,
+    player_id  TEXT NOT NULL,
+    room_id    TEXT NOT NULL,
+    PRIMARY KEY (session_id, player_id, room_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seen (
+    session_id TEXT NOT NULL,
+    player_id  TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    ref_id     TEXT NOT NULL,
+    PRIMARY KEY (session_id, player_id, kind, ref_id)
+) WITHOUT ROWID;
+"""
+
+
+# table -> (key columns, value columns); keys exclude session_id
+_TABLES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "players": (("player_id",), ("turn_slot", "name", "location_id", "health", "sanity")),
+    "inventory": (("player_id", "slot"), ("item_id",)),
+    "item_locations": (("item_id",), ("room_id", "slot")),
+    "inspected_rooms": (("player_id", "room_id"), ()),
+    "seen": (("player_id", "kind", "ref_id"), ()),
+}
+
+Rows = Dict[tuple, tuple]
+
+
+@dataclass
+class SessionSnapshot:
+    """
+    Row-level image of one session's mutable state, used to diff turns.
+    """
+    scenario_dir: str
+    header: tuple
+    tables: Dict[str, Rows] = field(default_factory=dict)
+
+
+def snapshot_state(scenario_dir: str, state: GameState) -> SessionSnapshot:
+    header = (
+        state.turn_number,
+        state.current_turn_index,
+        int(state.active),
+        state.winner_id,
+    )
+
+    players: Rows = {}
+    inventory: Rows = {}
+    for slot, pid in enumerate(state.turn_order):
+        p = state.players[pid]
+        players[(pid,)] = (slot, p.name, p.location_id, p.health, p.sanity)
+        for i, item in enumerate(p.inventory):
+            inventory[(pid, i)] = (item.id,)
+
+    item_locations: Rows = {}
+    slots: Dict[str, int] = {}
+    for room_id, item in state.world.placed_items():
+        slot = slots.get(room_id, 0)
+        slots[room_id] = slot + 1
+        item_locations[(item.id,)] = (room_id, slot)
+
+    inspected: Rows = {}
+    for pid, rooms in state.inspected_rooms.items():
+        for rid in rooms:
+            inspected[(pid, rid)] = ()
+
+    seen: Rows = {}
+    for pid, rooms in state.seen_rooms.items():
+        for rid in rooms:
+            seen[(pid, "room", rid)] = ()
+    for pid, rooms in state.studied_rooms.items():
+        for rid in rooms:
+            seen[(pid, "detail", rid)] = ()
+    for pid, item_ids in state.seen_items.items():
+        for iid in item_ids:
+            seen[(pid, "item", iid)] = ()
+
+    return SessionSnapshot(
+        scenario_dir=scenario_dir,
+        header=header,
+        tables={
+            "players": players,
+            "inventory": inventory,
+            "item_locations": item_locations,
+            "inspected_rooms": inspected,
+            "seen": seen,
+        },
+    )
+
+
+class _ConnectionPool:
+    """
+    Fixed-size pool of reader connections; SQLite in WAL mode lets these
+    read concurrently with the single writer.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int) -> None:
+        self._connect = connect
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._size = size
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self._size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+class CampaignStore:
+    """
+    Persistent per-session game state in SQLite (WAL mode).
+
+    Only mutable state is stored; the world itself is rebuilt from the
+    scenario files on load. Turns are recorded cheaply and written as
+    row deltas in batches (every `batch_turns` recorded turns, or on
+    flush()).
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, batch_turns: int = 32) -> None:
+        self.path = path
+        self.batch_turns = batch_turns
+
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._readers = _ConnectionPool(self._connect, pool_size)
+
+        # session_id -> last snapshot known to be on disk
+        self._persisted: Dict[str, SessionSnapshot] = {}
+        # session_id -> (scenario_dir, live state) waiting for the next flush
+        self._dirty: Dict[str, Tuple[str, GameState]] = {}
+        self._pending_turns = 0
+
+        self.turns_recorded = 0
+        self.rows_written = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=OFF")
+        return conn
+
+    def close(self) -> None:
+        self.flush()
+        self._readers.close()
+        self._writer.close()
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def save(self, session_id: str, scenario_dir: str, state: GameState) -> None:
+        """
+        Write a session immediately (e.g. when it is created or parked).
+        """
+        self._dirty[session_id] = (scenario_dir, state)
+        self.flush()
+
+    def record_turn(self, session_id: str, scenario_dir: str, state: GameState) -> None:
+        """
+        Mark a session as changed by one turn. Rows are written when the
+        batch fills up; several turns of one session collapse into one delta.
+        """
+        self._dirty[session_id] = (scenario_dir, state)
+        self._pending_turns += 1
+        self.turns_recorded += 1
+        if self._pending_turns >= self.batch_turns:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+
+        dirty = self._dirty
+        self._dirty = {}
+        self._pending_turns = 0
+
+        upserts: Dict[str, List[tuple]] = {t: [] for t in _TABLES}
+        deletes: Dict[str, List[tuple]] = {t: [] for t in _TABLES}
+        headers: List[tuple] = []
+        snapshots: Dict[str, SessionSnapshot] = {}
+        now = time.time()
+
+        for session_id, (scenario_dir, state) in dirty.items():
+            new = snapshot_state(scenario_dir, state)
+            old = self._persisted.get(session_id)
+            snapshots[session_id] = new
+
+            if old is None or old.header != new.header or old.scenario_dir != new.scenario_dir:
+                headers.append((session_id, scenario_dir, *new.header, now))
+
+            for table in _TABLES:
+                old_rows = old.tables.get(table, {}) if old is not None else {}
+                new_rows = new.tables[table]
+                for key, values in new_rows.items():
+                    if old_rows.get(key) != values:
+                        upserts[table].append((session_id, *key, *values))
+                for key in old_rows.keys() - new_rows.keys():
+                    deletes[table].append((session_id, *key))
+
+        with self._write_lock:
+            conn = self._writer
+            conn.execute("BEGIN")
+            try:
+                if headers:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        headers,
+                    )
+                for table, (keys, values) in _TABLES.items():
+                    where = " AND ".join(f"{k} = ?" for k in ("session_id", *keys))
+                    if deletes[table]:
+                        conn.executemany(f"DELETE FROM {table} WHERE {where}", deletes[table])
+                    if upserts[table]:
+                        marks = ", ".join("?" for _ in range(1 + len(keys) + len(values)))
+                        conn.executemany(
+                            f"INSERT OR REPLACE INTO {table} "
+                            f"(session_id, {', '.join(keys + values)}) VALUES ({marks})",
+                            upserts[table],
+                        )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                # keep the states queued so the next flush retries them
+                dirty.update(self._dirty)
+                self._dirty = dirty
+                raise
+
+        self.rows_written += len(headers) + sum(
+            len(rows) for rows in (*upserts.values(), *deletes.values())
+        )
+        self._persisted.update(snapshots)
+
+    def forget(self, session_id: str) -> None:
+        """
+        Drop the in-memory diff baseline for a parked session.
+        The next write for it will be a full rewrite of its rows.
+        """
+        self._persisted.pop(session_id, None)
+
+    def delete(self, session_id: str) -> None:
+        self._dirty.pop(session_id, None)
+        self._persisted.pop(session_id, None)
+        with self._write_lock:
+            conn = self._writer
+            conn.execute("BEGIN")
+            try:
+                for table in ("sessions", *_TABLES):
+                    conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def session_ids(self) -> List[str]:
+        with self._readers.connection() as conn:
+            return [r[0] for r in conn.execute("SELECT session_id FROM sessions ORDER BY session_id")]
+
+    def load(self, session_id: str) -> Optional[SessionSnapshot]:
+        if session_id in self._dirty:
+            # unflushed turns are newer than what is on disk
+            scenario_dir, state = self._dirty[session_id]
+            return snapshot_state(scenario_dir, state)
+
+        with self._readers.connection() as conn:
+            row = conn.execute(
+                "SELECT scenario_dir, turn_number, current_turn_index, active, winner_id "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            snap = SessionSnapshot(scenario_dir=row[0], header=tuple(row[1:]))
+            for table, (keys, values) in _TABLES.items():
+                cols = ", ".join(keys + values)
+                rows: Rows = {}
+                for r in conn.execute(f"SELECT {cols} FROM {table} WHERE session_id = ?", (session_id,)):
+                    rows[tuple(r[: len(keys)])] = tuple(r[len(keys):])
+                snap.tables[table] = rows
+
+        self._persisted[session_id] = snap
+        return snap
+
+
+def apply_snapshot(state: GameState, snap: SessionSnapshot) -> None:
+    """
+    Overwrite a freshly set-up GameState with the stored session state.
+    Items are matched by id against the ones the scenario just placed.
+    """
+    state.turn_number, state.current_turn_index, active, state.winner_id = snap.header
+    state.active = bool(active)
+
+    players = snap.tables.get("players", {})
+    inventory = snap.tables.get("inventory", {})
+    item_locations = snap.tables.get("item_locations", {})
+
+    # worlds that load regions on demand bring in every room the snapshot
+    # refers to and every region whose file places a snapshot item, so
+    # those defaults are cleared below instead of reappearing later
+    state.world.ensure_loaded(
+        room_ids=[row[2] for row in players.values()] + [room_id for room_id, _ in item_locations.values()],
+        item_ids=[item_id for (item_id,) in inventory.values()] + [item_id for (item_id,) in item_locations],
+    )
+    state.items.rebuild(state.world, state.players.values())
+
+    # the engine's item index already knows every placed item, so only
+    # rooms that actually hold items are touched
+    items: Dict[str, Item] = dict(state.items.items)
+    for room_id in {ref for kind, ref in state.items.holders.values() if kind == "room"}:
+        loc = state.world.get_location(room_id)
+        if loc is not None:
+            loc.take_items()
+    for player in state.players.values():
+        for item in player.inventory:
+            items[item.id] = item
+        player.inventory.clear()
+
+    for (pid,), (_, name, location_id, health, sanity) in players.items():
+        player = state.players.get(pid)
+        if player is None:
+            continue
+        player.name = name
+        player.health = health
+        player.sanity = sanity
+        state.move_player(pid, location_id)
+
+    for (pid, _), (item_id,) in sorted(inventory.items()):
+        if pid in state.players and item_id in items:
+            state.players[pid].inventory.append(items[item_id])
+
+    placed = sorted(item_locations.items(), key=lambda kv: kv[1])
+    for (item_id,), (room_id, _) in placed:
+        loc = state.world.get_location(room_id)
+        if loc is not None and item_id in items:
+            loc.place_item(items[item_id])
+
+    # drop regions loaded only for the restore; players may be far from start
+    state.world.settle(state.occupancy.room_players)
+    state.items.rebuild(state.world, state.players.values())
+
+    inspected: Dict[str, Set[str]] = {}
+    for pid, rid in snap.tables.get("inspected_rooms", {}):
+        inspected.setdefault(pid, set()).add(rid)
+    state.inspected_rooms = inspected
+
+    state.seen_rooms = {}
+    state.seen_items = {}
+    state.studied_rooms = {}
+    targets = {"room": state.seen_rooms, "detail": state.studied_rooms}
+    for pid, kind, ref in snap.tables.get("seen", {}):
+        targets.get(kind, state.seen_items).setdefault(pid, set()).add(ref)
+
+    state.messages.clear()
+
+
+class CampaignHost:
+    """
+    Many parked sessions, few loaded ones.
+
+    Sessions are loaded from the store on their first command and parked
+    (flushed and dropped from memory) once more than `max_loaded` are live.
+    """
+
+    def __init__(
+        self,
+        store: CampaignStore,
+        scenario_factory: Callable[[str], Scenario],
+        player_ids: Sequence[str] = ("P1", "P2"),
+        max_loaded: int = 256,
+    ) -> None:
+        self.store = store
+        self.scenario_factory = scenario_factory
+        self.player_ids = tuple(player_ids)
+        self.max_loaded = max_loaded
+        self._loaded: "OrderedDict[str, Tuple[str, GameEngine]]" = OrderedDict()
+
+    def _new_state(self) -> GameState:
+        players: Dict[str, Player] = {
+            pid: Player(id=pid, name=f"Player {i + 1}", location_id="")
+            for i, pid in enumerate(self.player_ids)
+        }
+        return GameState(world=None, players=players, turn_order=list(self.player_ids))  # type: ignore[arg-type]
+
+    def create(self, session_id: str, scenario_dir: str) -> GameEngine:
+        state = self._new_state()
+        engine = GameEngine(state, self.scenario_factory(scenario_dir))
+        self.store.save(session_id, scenario_dir, state)
+        self._remember(session_id, scenario_dir, engine)
+        return engine
+
+    def engine(self, session_id: str) -> GameEngine:
+        if session_id in self._loaded:
+            self._loaded.move_to_end(session_id)
+            return self._loaded[session_id][1]
+
+        snap = self.store.load(session_id)
+        if snap is None:
+            raise KeyError(f"Unknown session '{session_id}'")
+
+        state = self._new_state()
+        engine = GameEngine(state, self.scenario_factory(snap.scenario_dir))
+        apply_snapshot(state, snap)
+        self._remember(session_id, snap.scenario_dir, engine)
+        return engine
+
+    def process_command(self, session_id: str, command: str) -> List[str]:
+        """
+        Run one command for whoever's turn it is and return the messages
+        it produced. Mirrors the turn flow of the CLI loop.
+        """
+        engine = self.engine(session_id)
+        state = engine.state
+        player_id = state.current_player().id
+
+        if engine.process_command(player_id, command):
+            engine.end_of_turn(player_id)
+            if state.active:
+                state.next_player()
+            self.store.record_turn(session_id, self._loaded[session_id][0], state)
+
+        messages = list(state.messages)
+        state.messages.clear()
+        return messages
+
+    def park(self, session_id: str) -> None:
+        entry = self._loaded.pop(session_id, None)
+        if entry is None:
+            return
+        scenario_dir, engine = entry
+        self.store.save(session_id, scenario_dir, engine.state)
+        self.store.forget(session_id)
+
+    def park_all(self) -> None:
+        for session_id in list(self._loaded):
+            self.park(session_id)
+
+    def _remember(self, session_id: str, scenario_dir: str, engine: GameEngine) -> None:
+        self._loaded[session_id] = (scenario_dir, engine)
+        self._loaded.move_to_end(session_id)
+        while len(self._loaded) > self.max_loaded:
+            oldest = next(iter(self._loaded))
+            self.park(oldest)
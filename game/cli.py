@@ -3,13 +3,17 @@ from __future__ import annotations
 
 from typing import Dict, Optional
 import argparse
+import asyncio
 import os
 import random
+import shutil
 
 from .entities import Player
 from .game_state import GameState
-from .engine import GameEngine
-from .yaml_scenario import YamlScenario
+from .engine import MAX_SANITY, GameEngine
+from .regional_scenario import open_scenario
+from .scenario_catalog import ScenarioCatalog, catalog_roots
+from .realtime import RealtimeConfig, RealtimeScheduler
 
 
 def clear_screen() -> None:
@@ -19,9 +23,17 @@ def clear_screen() -> None:
 def run_cli_game() -> None:
     args = _parse_args()
 
+    if args.list_scenarios or args.search is not None:
+        print_catalog(args)
+        return
+
     scenario_dir = args.scenario_dir
     if scenario_dir is None:
-        scenario_dir = f"dev/scenario_{args.scenario}"
+        entry = ScenarioCatalog(catalog_roots(args.scenario_root)).resolve(args.scenario)
+        if entry is not None:
+            scenario_dir = entry.path
+        else:
+            scenario_dir = f"dev/scenario_{args.scenario}"
 
     world_placeholder = None  # type: ignore
 
@@ -36,8 +48,9 @@ def run_cli_game() -> None:
         turn_order=["P1", "P2"],
     )
 
-    scenario = YamlScenario(scenario_dir)
-    engine = GameEngine(state, scenario)
+    scenario = open_scenario(scenario_dir)
+    width = args.width or shutil.get_terminal_size().columns
+    engine = GameEngine(state, scenario, width=width)
 
     print("=== Welcome to the Cult of Azathoth (Pass & Play) ===")
     print(f"Scenario: {scenario.name}")
@@ -47,6 +60,11 @@ def run_cli_game() -> None:
 
     flush_messages(state, None)
 
+    if args.realtime:
+        config = RealtimeConfig.from_dict(scenario.realtime)
+        asyncio.run(run_realtime_loop(state, engine, config))
+        return
+
     while state.active:
         current_player = state.current_player()
 
@@ -98,13 +116,102 @@ def run_cli_game() -> None:
     print("Game over.")
 
 
+async def run_realtime_loop(state: GameState, engine: GameEngine, config: RealtimeConfig) -> None:
+    """
+    Same pass-and-play loop, but input is read off the event loop so the
+    scheduler keeps ticking while a player thinks.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def ask(prompt: str) -> str:
+        return await loop.run_in_executor(None, input, prompt)
+
+    def on_timer_messages() -> None:
+        flush_messages(state, state.current_player().id)
+        if not state.active:
+            # the prompt thread is still blocked on input()
+            print("(Press Enter to continue.)")
+
+    scheduler = RealtimeScheduler(engine, config, on_messages=on_timer_messages)
+    ticker = asyncio.create_task(scheduler.run())
+
+    try:
+        while state.active:
+            current_player = state.current_player()
+
+            print()
+            print(f"--- Turn {state.turn_number} ---")
+            print(f"It is {current_player.name}'s turn.")
+            print("(Pass the keyboard to them.)")
+            await ask("Press Enter when ready...")
+            if not state.active:
+                break
+
+            clear_screen()
+
+            engine.describe_surroundings(current_player.id)
+            flush_messages(state, current_player.id)
+
+            while state.active:
+                print()
+                print(f"{current_player.name}, what do you do?")
+                print("(Type 'help' for a list of commands.)")
+                command = (await ask("> ")).strip()
+                if not state.active:
+                    break
+
+                if command.lower() in ("end", "quit", "exit"):
+                    state.active = False
+                    state.add_message("You choose to abandon this place... for now.")
+                    flush_messages(state, current_player.id)
+                    break
+
+                turn_consumed = engine.process_command(current_player.id, command)
+                flush_messages(state, current_player.id)
+
+                if turn_consumed:
+                    # ambient danger comes from the clock here, not from turns
+                    engine.check_end_conditions()
+                    flush_messages(state, current_player.id)
+                    break
+
+            if not state.active:
+                break
+
+            state.next_player()
+    finally:
+        ticker.cancel()
+
+    flush_messages(state, None)
+    print()
+    print("Game over.")
+    print(scheduler.jitter.report())
+
+
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(add_help=True)
     p.add_argument("--scenario", default=os.environ.get("SCENARIO", "manor"))
     p.add_argument("--scenario-dir", default=os.environ.get("SCENARIO_DIR"))
+    p.add_argument("--width", type=int, default=None, help="Wrap room text to this many columns")
+    p.add_argument("--scenario-root", action="append", default=[],
+                   help="Extra directory containing scenario_* folders (repeatable)")
+    p.add_argument("--list-scenarios", action="store_true", help="List available scenarios and exit")
+    p.add_argument("--search", default=None, help="List scenarios matching this text and exit")
+    p.add_argument("--realtime", action="store_true",
+                   help="Ambient danger and timers run on a clock instead of per turn")
     return p.parse_args()
 
 
+def print_catalog(args: argparse.Namespace) -> None:
+    catalog = ScenarioCatalog(catalog_roots(args.scenario_root))
+    entries = catalog.search(args.search) if args.search is not None else catalog.entries()
+    if not entries:
+        print("No scenarios found.")
+        return
+    for e in entries:
+        print(f"  {e.key:<20} {e.name:<28} {e.mode}")
+
+
 def flush_messages(state: GameState, player_id: Optional[str]) -> None:
     if not state.messages:
         return
@@ -124,10 +231,9 @@ def flush_messages(state: GameState, player_id: Optional[str]) -> None:
 
 
 def degrade_text(message: str, sanity: int) -> str:
-    max_sanity = 10
-    sanity = max(0, min(sanity, max_sanity))
+    sanity = max(0, min(sanity, MAX_SANITY))
 
-    severity = (max_sanity - sanity) / max_sanity
+    severity = (MAX_SANITY - sanity) / MAX_SANITY
     if severity <= 0:
         return message
 
@@ -151,6 +257,9 @@ def print_controls() -> None:
     print("  move <room name or id>       - Move to an adjacent location")
     print("  search / s                   - Search the area for items")
     print("  use <item>                   - Use an item in your inventory")
+    print("  drop <item>                  - Put an item down here")
+    print("  where <item>                 - Sense where an item is")
+    print("  recall <word>                - Remember where you saw something")
     print("  status                       - View your status")
     print("  help                         - Show this help")
     print("  end / quit                   - End the game")
@@ -1,20 +1,40 @@
 # game/engine.py
 from __future__ import annotations
-from typing import Optional, Tuple
-import random
+from typing import List, Optional, Tuple
 
 from .game_state import GameState
 from .scenario import Scenario
 from .entities import Player, Item
 from .world import Location
+from .render import RoomRenderCache, wrap_text
+from .ambient import DEFAULT_AMBIENT, carried_tags
+
+MAX_SANITY = 10
+
+
+def _apply_deltas(player: Player, health: int = 0, sanity: int = 0) -> None:
+    """
+    Change health and sanity. Sanity gains stop at MAX_SANITY; losses
+    are never clamped.
+    """
+    player.health += health
+    if sanity > 0:
+        player.sanity = min(MAX_SANITY, player.sanity + sanity)
+    else:
+        player.sanity += sanity
 
 
 class GameEngine:
-    def __init__(self, state: GameState, scenario: Scenario) -> None:
+    def __init__(self, state: GameState, scenario: Scenario, width: Optional[int] = None) -> None:
         self.state = state
         self.scenario = scenario
+        self.render = RoomRenderCache(width)
 
         self.scenario.initial_setup(self.state)
+        self.text_index = self.scenario.text_index(self.state.world)
+        self.state.items.rebuild(self.state.world, self.state.players.values())
+        self.state.world.add_load_listener(self._on_rooms_loaded)
+        self.state.world.settle(self.state.occupancy.room_players)
 
     def process_command(self, player_id: str, command_str: str) -> bool:
         """
@@ -42,8 +62,15 @@ class GameEngine:
             self._handle_search(player_id)
         elif verb in ("use", "u"):
             self._handle_use(player_id, arg)
+        elif verb in ("drop", "d"):
+            self._handle_drop(player_id, arg)
+        elif verb == "where":
+            self._handle_where(player_id, arg)
         elif verb in ("status", "stats"):
             self._handle_status(player_id)
+        elif verb in ("recall", "r"):
+            self._handle_recall(player_id, arg)
+            consumes_turn = False
         elif verb in ("help", "?"):
             self._handle_help(player_id)
             consumes_turn = False
@@ -55,6 +82,25 @@ class GameEngine:
 
         return consumes_turn
 
+    def _on_rooms_loaded(self, rooms: List[Location]) -> None:
+        """
+        A region was loaded mid-game: index its rooms and items. Items the
+        region file places that are already known to be elsewhere (carried,
+        or moved before a campaign was resumed) are not put back.
+        """
+        for loc in rooms:
+            self.text_index.add_location(loc)
+            stale = [
+                item for item in loc.items
+                if self.state.items.where(item.id) not in (None, ("room", loc.id))
+            ]
+            if stale:
+                loc.items = [item for item in loc.items if item not in stale]
+                loc.version += 1
+            for item in loc.items:
+                self.text_index.add_item(item)
+                self.state.items.place_in_room(item, loc.id)
+
     def _split_command(self, command_str: str) -> Tuple[str, str]:
         parts = command_str.split(maxsplit=1)
         if len(parts) == 1:
@@ -76,16 +122,12 @@ class GameEngine:
             self.state.add_message("You are nowhere. That seems… bad.")
             return
 
-        inspected = loc.id in self.state.inspected_rooms.get(player_id, set())
+        self.state.mark_seen(player_id, room_id=loc.id)
 
-        if inspected:
-            text = (loc.detail_description or "").strip()
-            if not text:
-                text = (loc.description or "").strip()
-        else:
-            text = (loc.description or "").strip()
+        inspected = loc.id in self.state.inspected_rooms.get(player_id, set())
+        text = self.render.glance(loc, inspected)
 
-        desc_lines = [f"{player.name}, you are in {loc.name}."]
+        desc_lines = [wrap_text(f"{player.name}, you are in {loc.name}.", self.render.width)]
         if text:
             desc_lines.append(text)
 
@@ -100,39 +142,26 @@ class GameEngine:
             self.state.add_message("You are nowhere. That seems… bad.")
             return
 
-        detail = (loc.detail_description or "").strip()
-        if not detail:
-            detail = "You don't notice anything new."
+        self.state.mark_seen(player_id, room_id=loc.id, item_ids=[item.id for item in loc.items], studied=True)
 
-        desc_lines = [
-            f"You take a careful look around {loc.name}.",
-            detail,
-        ]
+        desc_lines = [self.render.look(loc, self.state.world)]
 
-        if loc.neighbors:
-            neighbor_names = []
-            for nid in loc.neighbors:
-                nloc = self.state.world.get_location(nid)
-                if nloc:
-                    neighbor_names.append(f"{nloc.name} ({nid})")
-                else:
-                    neighbor_names.append(nid)
-            neighbors_str = ", ".join(neighbor_names)
-            desc_lines.append(f"Exits lead to: {neighbors_str}.")
-
-        if loc.items:
-            item_list = ", ".join(item.name for item in loc.items)
-            desc_lines.append(f"On closer inspection, you notice: {item_list} on the ground.")
-        else:
-            desc_lines.append("You don't see anything obviously useful, just the unsettling details of the room.")
+        others = [
+            self.state.players[pid].name
+            for pid in self.state.occupancy.occupants(loc.id)
+            if pid != player_id
+        ]
+        if others:
+            desc_lines.append(wrap_text(f"Here with you: {', '.join(sorted(others))}.", self.render.width))
 
         player_items = player.inventory
         if player_items:
             inv_list = ", ".join(item.name for item in player_items)
-            desc_lines.append(f"Carrying: {inv_list}.")
+            desc_lines.append(wrap_text(f"Carrying: {inv_list}.", self.render.width))
 
         self.state.add_message("\n".join(desc_lines))
- def _handle_move(self, player_id: str, target: str) -> None:
+
+    def _handle_move(self, player_id: str, target: str) -> None:
         player, loc = self._get_player_and_location(player_id)
         if loc is None:
             self.state.add_message("You cannot move from here.")
@@ -144,29 +173,42 @@ class GameEngine:
 
         target_lower = target.lower()
 
-        # Try by id
+        # Try by id, then by id within this room's region
         destination_id: Optional[str] = None
+        region = loc.id.rpartition("/")[0]
         if target_lower in loc.neighbors:
             destination_id = target_lower
+        elif region and f"{region}/{target_lower}" in loc.neighbors:
+            destination_id = f"{region}/{target_lower}"
         else:
-            # Try by location name
-            for nid in loc.neighbors:
-                nloc = self.state.world.get_location(nid)
-                if nloc and nloc.name.lower() == target_lower:
-                    destination_id = nloc.id
-                    break
+            # Try by room id without its region prefix, then by location
+            # name; either must pick out a single exit
+            matches = sorted(nid for nid in loc.neighbors if nid.rpartition("/")[2] == target_lower)
+            if not matches:
+                for nid in sorted(loc.neighbors):
+                    nloc = self.state.world.get_location(nid)
+                    if nloc and nloc.name.lower() == target_lower:
+                        matches.append(nid)
+            if len(matches) > 1:
+                self.state.add_message(f"Several paths answer to '{target}'. Which one? ({', '.join(matches)})")
+                return
+            if matches:
+                destination_id = matches[0]
 
         if not destination_id:
             self.state.add_message("You fumble in the dark, but there is no clear path that way.")
             return
 
-        player.location_id = destination_id
+        self.state.move_player(player_id, destination_id)
+        # region-sharded worlds load the next region and drop far ones here
+        self.state.world.settle(self.state.occupancy.room_players)
         new_loc = self.state.world.get_location(destination_id)
         if new_loc:
             self.state.add_message(f"You move into {new_loc.name}.")
             self.describe_surroundings(player_id)
         else:
             self.state.add_message("You step into an undefined void. Odd.")
+
     def _handle_search(self, player_id: str) -> None:
         player, loc = self._get_player_and_location(player_id)
         if loc is None:
@@ -181,12 +223,16 @@ class GameEngine:
             self.state.add_message("You search the area but find nothing useful.")
             return
 
+        self.state.mark_seen(player_id, item_ids=[item.id for item in loc.items])
+
         found_names = ", ".join(item.name for item in loc.items)
         self.state.add_message(f"You search carefully and find: {found_names}.")
         self.state.add_message("You pick them up.")
 
-        player.inventory.extend(loc.items)
-        loc.items.clear()
+        taken = loc.take_items()
+        for item in taken:
+            self.state.items.give_to_player(item, player_id)
+        player.inventory.extend(taken)
 
     def _handle_use(self, player_id: str, target: str) -> None:
         player = self.state.players[player_id]
@@ -199,40 +245,115 @@ class GameEngine:
             self.state.add_message("Use what? (Hint: use <item id or name>)")
             return
 
-        target_lower = target.lower()
-        item: Optional[Item] = None
-
-        # Try by id, then by name substring
-        for it in player.inventory:
-            if it.id.lower() == target_lower or target_lower in it.name.lower():
-                item = it
-                break
-
+        item = self._find_inventory_item(player, target)
         if not item:
             self.state.add_message("You fumble through your things but can't find that.")
             return
 
-        max_sanity = 10
-
         # Very simple item effects for now
         if "clarity" in item.tags:
-            player.sanity = max_sanity
+            player.sanity = MAX_SANITY
             self.state.add_message("You drink the clear draught. The whispers fall silent.")
             self.state.add_message("Your mind snaps back into focus. (Sanity fully restored)")
             player.inventory.remove(item)
+            self.state.items.remove(item.id)
         elif "potion" in item.tags:
-            player.health += 3
-            player.sanity = min(max_sanity, player.sanity + 2)
+            _apply_deltas(player, health=3, sanity=2)
             self.state.add_message("You drink the strange potion. Warmth spreads through your body.")
             self.state.add_message("You feel a little safer. (+3 health, +2 sanity)")
             player.inventory.remove(item)
+            self.state.items.remove(item.id)
         elif "light" in item.tags:
-            player.sanity = min(max_sanity, player.sanity + 1)
+            _apply_deltas(player, sanity=1)
             self.state.add_message("You raise the lantern. The darkness shrinks back a little.")
             self.state.add_message("Your mind steadies. (+1 sanity)")
         else:
             self.state.add_message("You fiddle with it, but nothing obvious happens.")
 
+    def _find_inventory_item(self, player: Player, target: str) -> Optional[Item]:
+        target_lower = target.lower()
+
+        # Try by id, then by name substring
+        for it in player.inventory:
+            if it.id.lower() == target_lower or target_lower in it.name.lower():
+                return it
+        return None
+
+    def _handle_drop(self, player_id: str, target: str) -> None:
+        player, loc = self._get_player_and_location(player_id)
+        if loc is None:
+            self.state.add_message("There is nowhere to put anything down.")
+            return
+
+        if not target:
+            self.state.add_message("Drop what? (Hint: drop <item id or name>)")
+            return
+
+        item = self._find_inventory_item(player, target)
+        if not item:
+            self.state.add_message("You fumble through your things but can't find that.")
+            return
+
+        player.inventory.remove(item)
+        loc.place_item(item)
+        self.state.items.place_in_room(item, loc.id)
+        self.state.add_message(f"You set down the {item.name}.")
+
+    def _handle_where(self, player_id: str, target: str) -> None:
+        if not target:
+            self.state.add_message("Where is what? (Hint: where <item id or name>)")
+            return
+
+        item = self.state.items.find(target)
+        holder = self.state.items.where(item.id) if item else None
+        if item is None:
+            # not in any room this session has loaded: where the scenario
+            # puts it, if that part of the world is still untouched
+            start = self.scenario.item_start(self.state.world, target)
+            if start is not None:
+                item, _, room_name = start
+                self.state.add_message(f"You sense the {item.name} somewhere in {room_name}.")
+                return
+        if item is None or holder is None:
+            self.state.add_message("You reach out with your mind, but find only static.")
+            return
+
+        kind, ref = holder
+        if kind == "player":
+            if ref == player_id:
+                self.state.add_message(f"The {item.name} is in your own hands.")
+            else:
+                self.state.add_message(f"You sense the {item.name} with {self.state.players[ref].name}.")
+            return
+
+        room_name = self.state.world.room_name(ref) or ref
+        self.state.add_message(f"You sense the {item.name} somewhere in {room_name}.")
+
+    def _handle_recall(self, player_id: str, query: str) -> None:
+        if not query:
+            self.state.add_message("Recall what? (Hint: recall <word>)")
+            return
+
+        player = self.state.players[player_id]
+        # a glance only shows the description; detail needs a look or search
+        studied = self.state.studied_rooms.get(player_id, set())
+        inspected = self.state.inspected_rooms.get(player_id, set())
+        scope = {
+            "room": self.state.seen_rooms.get(player_id, set()),
+            "detail": studied | inspected,
+            "item": self.state.seen_items.get(player_id, set()) | {item.id for item in player.inventory},
+        }
+        hits = self.text_index.search(query, scope=scope)
+        if not hits:
+            self.state.add_message(f"You search your memory for '{query}', but nothing surfaces.")
+            return
+
+        lines = [f"You remember '{query}'..."]
+        for hit in hits:
+            where = "in" if hit.kind == "room" else "on"
+            lines.append(f"  {where} {hit.name}: {hit.snippet}" if hit.snippet else f"  {where} {hit.name}")
+        self.state.add_message(wrap_text("\n".join(lines), self.render.width))
+
     def _handle_status(self, player_id: str) -> None:
         player = self.state.players[player_id]
         msg = (
@@ -250,6 +371,9 @@ class GameEngine:
             "  move <room name or id>       - Move to an adjacent location\n"
             "  search / s                   - Search the area for items\n"
             "  use <item>                   - Use an item in your inventory\n"
+            "  drop <item>                  - Put an item down here\n"
+            "  where <item>                 - Sense where an item is\n"
+            "  recall <word>                - Remember where you saw something\n"
             "  status                       - View your status\n"
             "  help                         - Show this help\n"
             "  end / quit                   - End the game\n"
@@ -258,22 +382,29 @@ class GameEngine:
 
     def _resolve_ambient_danger(self, player_id: str) -> None:
         """
-        Simple horror pressure:
-        - 20%: creepy noise (flavor).
-        - 15%: sanity chip.
-        - 10%: health chip.
+        Horror pressure: draw one event from the room's ambient table
+        (or DEFAULT_AMBIENT) and apply it, softened by carried items.
         """
         player = self.state.players[player_id]
-        roll = random.random()
+        table = self.scenario.ambient_table(player.location_id) or DEFAULT_AMBIENT
+        event = table.sample()
+        if event.is_quiet:
+            return
 
-        if roll < 0.2:
-            self.state.add_message("Something moves just out of sight. The air feels heavier.")
-        elif roll < 0.35:
-            player.sanity -= 1
-            self.state.add_message("A whisper curls into your ear in a voice you almost recognize. (-1 sanity)")
-        elif roll < 0.45:
-            player.health -= 1
-            self.state.add_message("A sudden, invisible weight presses on your chest. It hurts to breathe. (-1 health)")
+        health, sanity = event.effect_for(carried_tags(player.inventory))
+        _apply_deltas(player, health=health, sanity=sanity)
+
+        effects = []
+        if health:
+            effects.append(f"{health:+d} health")
+        if sanity:
+            effects.append(f"{sanity:+d} sanity")
+
+        message = event.message
+        if effects:
+            message = f"{message} ({', '.join(effects)})".strip()
+        if message:
+            self.state.add_message(message)
 
     def end_of_turn(self, player_id: str) -> None:
         """
@@ -284,6 +415,24 @@ class GameEngine:
             return
 
         self._resolve_ambient_danger(player_id)
+        self.check_end_conditions()
+
+    def apply_effect(self, player_id: str, message: str = "", health: int = 0, sanity: int = 0) -> None:
+        """
+        Apply a timed effect outside the turn flow (real-time mode),
+        then run the usual death/win checks.
+        """
+        if not self.state.active:
+            return
+
+        _apply_deltas(self.state.players[player_id], health=health, sanity=sanity)
+        if message:
+            self.state.add_message(message)
+        self.check_end_conditions()
+
+    def check_end_conditions(self) -> None:
+        if not self.state.active:
+            return
 
         # Check for death
         for p in self.state.players.values():
@@ -303,8 +452,5 @@ class GameEngine:
         self.state.active = False
         self.state.winner_id = winner_id
 
-        if winner_id == "BOTH":
-            self.state.add_message("You find each other in the darkness. For now, you are safe.")
-        else:
-            self.state.add_message(f"Player {winner_id} has won.")
+        self.state.add_message(self.scenario.win_message(winner_id))
 
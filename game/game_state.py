@@ -1,10 +1,12 @@
  # game/game_state.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 
 from .world import World
 from .entities import Player
+from .occupancy import Occupancy
+from .item_index import ItemIndex
 
 
 @dataclass
@@ -19,6 +21,13 @@ class GameState:
     messages: List[str] = field(default_factory=list)
 
     inspected_rooms: Dict[str, Set[str]] = field(default_factory=dict)
+    occupancy: Occupancy = field(default_factory=Occupancy)
+    items: ItemIndex = field(default_factory=ItemIndex)
+    # what each player has actually laid eyes on (for recall)
+    seen_rooms: Dict[str, Set[str]] = field(default_factory=dict)
+    seen_items: Dict[str, Set[str]] = field(default_factory=dict)
+    # rooms whose detail text the player has read with `look`
+    studied_rooms: Dict[str, Set[str]] = field(default_factory=dict)
 
     def current_player(self) -> Player:
         return self.players[self.turn_order[self.current_turn_index]]
@@ -29,5 +38,27 @@ class GameState:
             self.turn_number += 1
         return self.current_player()
 
+    def move_player(self, player_id: str, room_id: str) -> None:
+        """
+        Single entry point for changing a player's room, so the
+        occupancy index never drifts from Player.location_id.
+        """
+        self.players[player_id].location_id = room_id
+        self.occupancy.place(player_id, room_id)
+
+    def mark_seen(
+        self,
+        player_id: str,
+        room_id: Optional[str] = None,
+        item_ids: Iterable[str] = (),
+        studied: bool = False,
+    ) -> None:
+        if room_id is not None:
+            self.seen_rooms.setdefault(player_id, set()).add(room_id)
+            if studied:
+                self.studied_rooms.setdefault(player_id, set()).add(room_id)
+        if item_ids:
+            self.seen_items.setdefault(player_id, set()).update(item_ids)
+
     def add_message(self, message: str) -> None:
         self.messages.append(message)
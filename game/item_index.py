@@ -0,0 +1,94 @@
+# game/item_index.py
+from __future__ import annotations
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .entities import Item, Player
+from .world import World
+
+# ("room", room_id) or ("player", player_id)
+Holder = Tuple[str, str]
+
+
+class ItemIndex:
+    """
+    World-wide item lookup: item id -> where it is, tag -> item ids.
+
+    Items still physically live in Location.items / Player.inventory;
+    every transfer also goes through this index so "where is X" and
+    item-based win checks never scan rooms or inventories.
+    """
+
+    def __init__(self) -> None:
+        self.items: Dict[str, Item] = {}
+        self.holders: Dict[str, Holder] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.by_name: Dict[str, str] = {}
+
+    def rebuild(self, world: World, players: Iterable[Player]) -> None:
+        self.items.clear()
+        self.holders.clear()
+        self.by_tag.clear()
+        self.by_name.clear()
+        for room_id, item in world.placed_items():
+            self.place_in_room(item, room_id)
+        for player in players:
+            for item in player.inventory:
+                self.give_to_player(item, player.id)
+
+    def place_in_room(self, item: Item, room_id: str) -> None:
+        self._track(item)
+        self.holders[item.id] = ("room", room_id)
+
+    def give_to_player(self, item: Item, player_id: str) -> None:
+        self._track(item)
+        self.holders[item.id] = ("player", player_id)
+
+    def remove(self, item_id: str) -> None:
+        """
+        Forget an item that no longer exists (e.g. a drunk potion).
+        """
+        item = self.items.pop(item_id, None)
+        self.holders.pop(item_id, None)
+        if item is None:
+            return
+        for tag in item.tags:
+            ids = self.by_tag.get(tag)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self.by_tag[tag]
+        if self.by_name.get(item.name.lower()) == item_id:
+            del self.by_name[item.name.lower()]
+
+    def where(self, item_id: str) -> Optional[Holder]:
+        return self.holders.get(item_id)
+
+    def holder_of(self, item_id: str) -> Optional[str]:
+        """
+        Player id carrying the item, if any.
+        """
+        holder = self.holders.get(item_id)
+        if holder is None or holder[0] != "player":
+            return None
+        return holder[1]
+
+    def with_tag(self, tag: str) -> Set[str]:
+        return self.by_tag.get(tag, set())
+
+    def find(self, text: str) -> Optional[Item]:
+        """
+        Resolve an item by id or exact name (case-insensitive).
+        """
+        key = text.strip().lower()
+        item = self.items.get(key)
+        if item is None and key in self.by_name:
+            item = self.items.get(self.by_name[key])
+        return item
+
+    def _track(self, item: Item) -> None:
+        if item.id in self.items:
+            return
+        self.items[item.id] = item
+        for tag in item.tags:
+            self.by_tag.setdefault(tag, set()).add(item.id)
+        self.by_name.setdefault(item.name.lower(), item.id)
@@ -0,0 +1,56 @@
+# game/occupancy.py
+from __future__ import annotations
+from typing import Dict, Optional, Set
+
+
+class Occupancy:
+    """
+    Incremental room <-> player index.
+
+    Every move goes through `place`, so "who is here", "is anyone in X"
+    and "is everyone together" are answered without scanning players.
+    """
+
+    def __init__(self) -> None:
+        self.room_players: Dict[str, Set[str]] = {}
+        self.player_room: Dict[str, str] = {}
+
+    def place(self, player_id: str, room_id: str) -> None:
+        old_room = self.player_room.get(player_id)
+        if old_room == room_id:
+            return
+
+        if old_room is not None:
+            occupants = self.room_players[old_room]
+            occupants.discard(player_id)
+            if not occupants:
+                del self.room_players[old_room]
+
+        self.player_room[player_id] = room_id
+        self.room_players.setdefault(room_id, set()).add(player_id)
+
+    def remove(self, player_id: str) -> None:
+        old_room = self.player_room.pop(player_id, None)
+        if old_room is None:
+            return
+        occupants = self.room_players[old_room]
+        occupants.discard(player_id)
+        if not occupants:
+            del self.room_players[old_room]
+
+    def room_of(self, player_id: str) -> Optional[str]:
+        return self.player_room.get(player_id)
+
+    def occupants(self, room_id: str) -> Set[str]:
+        return self.room_players.get(room_id, set())
+
+    def is_occupied(self, room_id: str) -> bool:
+        return room_id in self.room_players
+
+    def all_together(self, player_count: int) -> bool:
+        """
+        True if all `player_count` players are placed and share one room.
+        """
+        if player_count < 2 or len(self.player_room) != player_count:
+            return False
+        return len(self.room_players) == 1
@@ -0,0 +1,290 @@
+# game/realtime.py
+"""
+Optional real-time mode: ambient danger, sanity decay and scripted timers
+fire on a clock instead of only after turn-consuming commands.
+
+Timers live in hashed timing wheels (one per player, plus one for
+scenario-wide timers), so scheduling and cancelling are O(1) and a tick
+only touches the timers in its own bucket. Effects go through the normal
+GameEngine handlers and GameState messages.
+
+rooms.yaml:
+
+  scenario:
+    realtime:
+      tick: 0.25              # seconds per scheduler tick
+      ambient_every: 20       # seconds between ambient rolls per player
+      sanity_decay_every: 60  # seconds between -1 sanity per player (0 = off)
+      timers:
+        - after: 120
+          message: "A bell tolls somewhere below."
+        - after: 300
+          every: 60
+          message: "The walls lean closer."
+          sanity: -1
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import asyncio
+import random
+
+from .engine import GameEngine
+
+
+@dataclass(frozen=True)
+class ScriptedTimer:
+    after: float
+    message: str = ""
+    every: float = 0.0
+    health: int = 0
+    sanity: int = 0
+
+
+@dataclass(frozen=True)
+class RealtimeConfig:
+    tick: float = 0.25
+    ambient_every: float = 20.0
+    sanity_decay_every: float = 60.0
+    timers: Tuple[ScriptedTimer, ...] = ()
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "RealtimeConfig":
+        timers_raw = raw.get("timers", [])
+        if timers_raw is None:
+            timers_raw = []
+        if not isinstance(timers_raw, list):
+            raise ValueError("rooms.yaml: 'scenario.realtime.timers' must be a list")
+
+        timers = []
+        for t in timers_raw:
+            if not isinstance(t, dict) or "after" not in t:
+                raise ValueError("rooms.yaml: each realtime timer must be a mapping with 'after'")
+            timers.append(ScriptedTimer(
+                after=float(t["after"]),
+                message=str(t.get("message", "")).strip(),
+                every=float(t.get("every", 0)),
+                health=int(t.get("health", 0)),
+                sanity=int(t.get("sanity", 0)),
+            ))
+
+        tick = float(raw.get("tick", cls.tick))
+        if tick <= 0:
+            raise ValueError("rooms.yaml: 'scenario.realtime.tick' must be positive")
+
+        return cls(
+            tick=tick,
+            ambient_every=float(raw.get("ambient_every", cls.ambient_every)),
+            sanity_decay_every=float(raw.get("sanity_decay_every", cls.sanity_decay_every)),
+            timers=tuple(timers),
+        )
+
+    def ticks(self, seconds: float) -> int:
+        return max(1, round(seconds / self.tick))
+
+
+@dataclass(eq=False)
+class Timer:
+    deadline: int
+    callback: Callable[[], None]
+    every: int = 0          # ticks between repeats; 0 = one-shot
+    cancelled: bool = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel. A timer sits in bucket deadline % slots; each
+    advance() visits one bucket and fires the timers that are due,
+    leaving later laps in place.
+    """
+
+    def __init__(self, slots: int = 512) -> None:
+        self.slots: List[List[Timer]] = [[] for _ in range(slots)]
+        self.now = 0
+        self.pending = 0
+
+    def schedule(self, delay: int, callback: Callable[[], None], every: int = 0) -> Timer:
+        timer = Timer(deadline=self.now + max(1, delay), callback=callback, every=every)
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer: Timer) -> None:
+        self.slots[timer.deadline % len(self.slots)].append(timer)
+        self.pending += 1
+
+    def advance(self) -> int:
+        """
+        Move one tick forward and fire what is due. Returns timers fired.
+        """
+        self.now += 1
+        bucket = self.slots[self.now % len(self.slots)]
+        if not bucket:
+            return 0
+
+        keep: List[Timer] = []
+        due: List[Timer] = []
+        for timer in bucket:
+            if timer.cancelled:
+                self.pending -= 1
+            elif timer.deadline <= self.now:
+                due.append(timer)
+                self.pending -= 1
+            else:
+                keep.append(timer)
+        bucket[:] = keep
+
+        for timer in due:
+            timer.callback()
+            if timer.every and not timer.cancelled:
+                timer.deadline = self.now + timer.every
+                self._insert(timer)
+        return len(due)
+
+
+@dataclass
+class JitterStats:
+    """
+    How late each tick fired relative to its schedule, in seconds.
+    """
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=10_000))
+    ticks: int = 0
+    worst: float = 0.0
+
+    def record(self, late: float) -> None:
+        self.ticks += 1
+        self.samples.append(late)
+        self.worst = max(self.worst, late)
+
+    def report(self) -> str:
+        if not self.samples:
+            return "Tick jitter: no ticks recorded."
+        ordered = sorted(self.samples)
+        mean = sum(ordered) / len(ordered)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return (
+            f"Tick jitter over {self.ticks} ticks: "
+            f"mean {mean * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, max {self.worst * 1000:.2f} ms"
+        )
+
+
+class RealtimeScheduler:
+    """
+    Drives timed effects for one game on an asyncio loop.
+    """
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        config: RealtimeConfig,
+        on_messages: Optional[Callable[[], None]] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.engine = engine
+        self.state = engine.state
+        self.config = config
+        self.on_messages = on_messages
+        self.rng = rng or random.Random()
+        self.jitter = JitterStats()
+
+        self.world_wheel = TimerWheel()
+        self.wheels: Dict[str, TimerWheel] = {pid: TimerWheel() for pid in self.state.players}
+
+        ambient = config.ticks(config.ambient_every)
+        decay = config.ticks(config.sanity_decay_every) if config.sanity_decay_every > 0 else 0
+        for pid, wheel in self.wheels.items():
+            # random phase so players' events don't all land on one tick
+            if config.ambient_every > 0:
+                wheel.schedule(self.rng.randint(1, ambient), self._ambient(pid), every=ambient)
+            if decay:
+                wheel.schedule(self.rng.randint(1, decay), self._decay(pid), every=decay)
+
+        for t in config.timers:
+            every = config.ticks(t.every) if t.every > 0 else 0
+            self.world_wheel.schedule(config.ticks(t.after), self._scripted(t), every=every)
+
+    # -------------------------
+    # Timer callbacks
+    # -------------------------
+
+    def _ambient(self, player_id: str) -> Callable[[], None]:
+        def fire() -> None:
+            with self._attributed(player_id):
+                self.engine.end_of_turn(player_id)
+        return fire
+
+    def _decay(self, player_id: str) -> Callable[[], None]:
+        def fire() -> None:
+            with self._attributed(player_id):
+                self.engine.apply_effect(
+                    player_id, "The dark wears at your mind. (-1 sanity)", sanity=-1
+                )
+        return fire
+
+    def _scripted(self, timer: ScriptedTimer) -> Callable[[], None]:
+        def fire() -> None:
+            if timer.message:
+                self.state.add_message(timer.message)
+            if timer.health or timer.sanity:
+                for pid in self.state.turn_order:
+                    self.engine.apply_effect(pid, health=timer.health, sanity=timer.sanity)
+            else:
+                self.engine.check_end_conditions()
+        return fire
+
+    def _attributed(self, player_id: str) -> "_Attribution":
+        return _Attribution(self, player_id)
+
+    # -------------------------
+    # Clock
+    # -------------------------
+
+    def tick(self) -> int:
+        """
+        Advance every wheel by one tick. Returns timers fired.
+        """
+        fired = self.world_wheel.advance()
+        for wheel in self.wheels.values():
+            fired += wheel.advance()
+        if self.state.messages and self.on_messages is not None:
+            self.on_messages()
+        return fired
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        period = self.config.tick
+        next_at = loop.time() + period
+
+        while self.state.active:
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+            now = loop.time()
+            self.jitter.record(max(0.0, now - next_at))
+
+            # catch up if the loop stalled for several ticks
+            while next_at <= now and self.state.active:
+                self.tick()
+                next_at += period
+
+
+class _Attribution:
+    """
+    Prefix messages produced by one player's timer with that player's
+    name, since in real time they may land during someone else's turn.
+    """
+
+    def __init__(self, scheduler: RealtimeScheduler, player_id: str) -> None:
+        self.state = scheduler.state
+        self.player_id = player_id
+        self.start = 0
+
+    def __enter__(self) -> None:
+        self.start = len(self.state.messages)
+
+    def __exit__(self, *exc: Any) -> None:
+        name = self.state.players[self.player_id].name
+        for i in range(self.start, len(self.state.messages)):
+            self.state.messages[i] = f"[{name}] {self.state.messages[i]}"
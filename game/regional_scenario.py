@@ -0,0 +1,541 @@
+# game/regional_scenario.py
+"""
+Region-sharded scenarios: the world is split into region files that are
+loaded when players get near them and dropped when nobody is.
+
+  dev/scenario_<name>/
+    rooms.yaml            - scenario block only (name, mode, starts, ...)
+    regions/<region>.yaml - one region: its rooms, items and ambient table
+
+Room ids are qualified as <region>/<room>. Inside a region file, exits and
+item locations may use the bare room id; an exit written as
+<other_region>/<room> is a border exit. Each border must be declared from
+both sides, so either region can be loaded on its own.
+
+Only the regions players stand in plus the regions across their borders
+are kept in memory. Items in an evicted room are kept only if they differ
+from what the region file places there.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import re
+
+from .ambient import AliasTable, parse_ambient_table
+from .entities import Item
+from .world import Location, World
+from .yaml_scenario import ScenarioConfig, YamlScenario, _parse_deliver
+
+try:
+    import yaml  # type: ignore
+except Exception as e:  # pragma: no cover
+    yaml = None
+    _yaml_import_error = e
+
+
+_REGION_RE = re.compile(r"^[a-z0-9_\-]+$")
+
+# parsed region files kept per scenario (shared by all its sessions)
+SPEC_CACHE_SIZE = 256
+
+
+def region_of(room_id: str) -> str:
+    return room_id.split("/", 1)[0] if "/" in room_id else ""
+
+
+def is_region_sharded(scenario_dir: str) -> bool:
+    return (Path(scenario_dir) / "regions").is_dir()
+
+
+def open_scenario(scenario_dir: str) -> YamlScenario:
+    """
+    YamlScenario for a classic scenario folder, RegionalScenario for one
+    with a regions/ directory.
+    """
+    if is_region_sharded(scenario_dir):
+        return RegionalScenario(scenario_dir)
+    return YamlScenario(scenario_dir)
+
+
+@dataclass(frozen=True)
+class RegionSpec:
+    """
+    One parsed region file. Shared between sessions; Locations and Items
+    are built fresh from it for each world that loads the region.
+    """
+    id: str
+    # (room id, name, description, detail_description)
+    rooms: Tuple[Tuple[str, str, str, str], ...]
+    # exits inside the region, each edge once
+    exits: Tuple[Tuple[str, str], ...]
+    # (own room, room in another region)
+    borders: Tuple[Tuple[str, str], ...]
+    # (item id, name, description, tags, room id)
+    items: Tuple[Tuple[str, str, str, Tuple[str, ...], str], ...]
+    ambient: Optional[AliasTable] = None
+    room_ambient: Dict[str, AliasTable] = field(default_factory=dict)
+
+    def default_items(self) -> Dict[str, Tuple[str, ...]]:
+        placed: Dict[str, List[str]] = {}
+        for item_id, _, _, _, room_id in self.items:
+            placed.setdefault(room_id, []).append(item_id)
+        return {rid: tuple(ids) for rid, ids in placed.items()}
+
+
+class _RegionalLocations(MutableMapping):
+    """
+    World.locations for a RegionalWorld. Looking up a room in a region
+    that is not loaded loads that region; iteration and len() cover the
+    loaded rooms only.
+    """
+
+    def __init__(self, world: "RegionalWorld") -> None:
+        self._world = world
+        self.loaded: Dict[str, Location] = {}
+
+    def __getitem__(self, room_id: str) -> Location:
+        loc = self.loaded.get(room_id)
+        if loc is not None:
+            return loc
+        region = region_of(room_id)
+        if region and region not in self._world.regions and self._world.scenario.has_region(region):
+            self._world.load_region(region)
+        return self.loaded[room_id]
+
+    def __contains__(self, room_id: object) -> bool:
+        if not isinstance(room_id, str):
+            return False
+        try:
+            self[room_id]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, room_id: str, loc: Location) -> None:
+        self.loaded[room_id] = loc
+
+    def __delitem__(self, room_id: str) -> None:
+        del self.loaded[room_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.loaded)
+
+    def __len__(self) -> int:
+        return len(self.loaded)
+
+
+class RegionalWorld(World):
+    """
+    Per-session World that pages regions in and out of memory.
+    """
+
+    def __init__(self, scenario: "RegionalScenario") -> None:
+        self.scenario = scenario
+        self.locations = _RegionalLocations(self)  # type: ignore[assignment]
+        # region -> its border edges (own room, foreign room)
+        self.regions: Dict[str, Set[Tuple[str, str]]] = {}
+        # items of evicted rooms that no longer match the region file
+        self._parked: Dict[str, List[Item]] = {}
+        # highest Location.version handed out; reloaded rooms start above
+        # it so version-keyed caches never see a stale (id, version) pair
+        self._high_water = 0
+        self._listeners: List[Callable[[List[Location]], None]] = []
+
+    def add_load_listener(self, callback: Callable[[List[Location]], None]) -> None:
+        self._listeners.append(callback)
+
+    def placed_items(self) -> Iterator[Tuple[str, Item]]:
+        for loc in self.locations.loaded.values():  # type: ignore[attr-defined]
+            for item in loc.items:
+                yield loc.id, item
+        for room_id, items in self._parked.items():
+            for item in items:
+                yield room_id, item
+
+    def room_name(self, room_id: str) -> Optional[str]:
+        loc = self.locations.loaded.get(room_id)  # type: ignore[attr-defined]
+        if loc is not None:
+            return loc.name
+        spec = self.scenario.cached_spec(region_of(room_id))
+        if spec is None:
+            return None
+        return next((name for rid, name, _, _ in spec.rooms if rid == room_id), None)
+
+    def settle(self, occupied_rooms: Iterable[str]) -> None:
+        """
+        Keep the occupied regions and their border neighbors loaded;
+        evict every other region.
+        """
+        active = {region_of(rid) for rid in occupied_rooms} - {""}
+        for region in active:
+            if region not in self.regions:
+                self.load_region(region)
+
+        keep = set(active)
+        for region in active:
+            keep.update(region_of(foreign) for _, foreign in self.regions[region])
+
+        for region in keep - set(self.regions):
+            self.load_region(region)
+        for region in set(self.regions) - keep:
+            self.evict_region(region)
+
+    def ensure_loaded(self, room_ids: Iterable[str] = (), item_ids: Iterable[str] = ()) -> None:
+        for room_id in room_ids:
+            self.get_location(room_id)
+        for item_id in item_ids:
+            region = self.scenario.item_region(item_id)
+            if region and region not in self.regions:
+                self.load_region(region)
+
+    def load_all(self) -> None:
+        """
+        Load every region (offline tools that need the whole graph).
+        """
+        for region in self.scenario.region_ids():
+            if region not in self.regions:
+                self.load_region(region)
+
+    def load_region(self, region: str) -> None:
+        spec = self.scenario.region_spec(region)
+        loaded = self.locations.loaded  # type: ignore[attr-defined]
+
+        rooms: List[Location] = []
+        for room_id, name, desc, detail in spec.rooms:
+            loc = Location(id=room_id, name=name, description=desc, detail_description=detail, region=region)
+            loaded[room_id] = loc
+            rooms.append(loc)
+
+        for a, b in spec.exits:
+            self.connect(a, b, bidirectional=True)
+        for own, foreign in spec.borders:
+            loaded[own].add_neighbor(foreign)
+        for item_id, name, desc, tags, room_id in spec.items:
+            loaded[room_id].place_item(Item(id=item_id, name=name, description=desc, tags=list(tags)))
+
+        self.regions[region] = set(spec.borders)
+        self._check_borders(region)
+
+        for loc in rooms:
+            parked = self._parked.pop(loc.id, None)
+            if parked is not None:
+                loc.items = parked
+            loc.version = self._high_water + 1
+
+        for callback in self._listeners:
+            callback(rooms)
+
+    def evict_region(self, region: str) -> None:
+        spec = self.scenario.cached_spec(region)
+        assert spec is not None
+        defaults = spec.default_items()
+        loaded = self.locations.loaded  # type: ignore[attr-defined]
+
+        for room_id, _, _, _ in spec.rooms:
+            loc = loaded.pop(room_id, None)
+            if loc is None:
+                continue
+            self._high_water = max(self._high_water, loc.version)
+            if tuple(item.id for item in loc.items) != defaults.get(room_id, ()):
+                self._parked[room_id] = loc.items
+        del self.regions[region]
+
+    def _check_borders(self, region: str) -> None:
+        """
+        Every border between two loaded regions must be declared by both.
+        """
+        mine = self.regions[region]
+        for other, theirs in self.regions.items():
+            if other == region:
+                continue
+            for own, foreign in mine:
+                if region_of(foreign) == other and (foreign, own) not in theirs:
+                    raise ValueError(
+                        f"regions/{other}.yaml: missing border exit '{foreign}' -> '{own}' "
+                        f"(declared from regions/{region}.yaml)"
+                    )
+            for own, foreign in theirs:
+                if region_of(foreign) == region and (foreign, own) not in mine:
+                    raise ValueError(
+                        f"regions/{region}.yaml: missing border exit '{foreign}' -> '{own}' "
+                        f"(declared from regions/{other}.yaml)"
+                    )
+
+
+class RegionalScenario(YamlScenario):
+    """
+    YamlScenario whose rooms and items live in per-region files that are
+    read on demand. Modes, starts and win checks work as in YamlScenario,
+    with rooms named by their qualified <region>/<room> ids.
+    """
+
+    def __init__(self, scenario_dir: str) -> None:
+        super().__init__(scenario_dir)
+        self.regions_dir = self.scenario_dir / "regions"
+        # item id -> region whose file places it, for every region read so far
+        self._item_regions: Dict[str, str] = {}
+        # lowercased item name -> item id, for the same regions
+        self._item_names: Dict[str, str] = {}
+        self._indexed_regions: Set[str] = set()
+        # region -> (mtime_ns, spec), least recently used first
+        self._specs: "OrderedDict[str, Tuple[int, RegionSpec]]" = OrderedDict()
+
+    def has_region(self, region: str) -> bool:
+        return bool(_REGION_RE.match(region)) and (self.regions_dir / f"{region}.yaml").is_file()
+
+    def region_ids(self) -> List[str]:
+        return sorted(p.stem for p in self.regions_dir.glob("*.yaml") if _REGION_RE.match(p.stem))
+
+    def _load(self) -> Tuple[ScenarioConfig, World]:
+        if yaml is None:  # pragma: no cover
+            raise RuntimeError(
+                "PyYAML is not installed. Install it with: pip install pyyaml"
+            ) from _yaml_import_error
+
+        rooms_path = self.scenario_dir / "rooms.yaml"
+        if not rooms_path.exists():
+            raise FileNotFoundError(f"Missing rooms.yaml: {rooms_path}")
+
+        rooms_doc = self._load_yaml(rooms_path)
+        config = self._parse_config(rooms_doc)
+        if not config.starts:
+            raise ValueError("rooms.yaml: region-sharded scenarios need 'scenario.starts'")
+        for pid, room in config.starts.items():
+            if not self.has_region(region_of(room)):
+                raise ValueError(
+                    f"rooms.yaml: start room '{room}' for player '{pid}' must be <region>/<room> "
+                    f"with a matching regions/<region>.yaml"
+                )
+
+        scen = rooms_doc.get("scenario") or {}
+        self._default_ambient = None
+        if scen.get("ambient") is not None:
+            self._default_ambient = parse_ambient_table(scen["ambient"], "rooms.yaml: scenario")
+
+        world = RegionalWorld(self)
+        # players without a start fall back to the first loaded room
+        world.load_region(region_of(next(iter(config.starts.values()))))
+        self._check_mode(config.mode, world)
+        return config, world
+
+    def _check_mode(self, mode: str, world: World) -> None:
+        # items can sit in any region, so only room targets are checked
+        if mode.startswith("collect:"):
+            return
+        if mode.startswith("deliver:"):
+            item_id, room_id = _parse_deliver(mode)
+            if room_id not in world.locations:
+                raise ValueError(f"rooms.yaml: mode '{mode}' targets unknown room '{room_id}'")
+            spec = self.cached_spec(region_of(room_id))
+            if spec is not None and item_id in spec.default_items().get(room_id, ()):
+                raise ValueError(f"rooms.yaml: mode '{mode}' is won before play; '{item_id}' starts in '{room_id}'")
+            return
+        super()._check_mode(mode, world)
+
+    def ambient_table(self, room_id: str) -> Optional[AliasTable]:
+        # rolled every turn: the player's region is loaded, so its spec is
+        # normally cached and no file is touched
+        spec = self.cached_spec(region_of(room_id))
+        if spec is None:
+            return self._default_ambient
+        table = spec.room_ambient.get(room_id, spec.ambient)
+        return table if table is not None else self._default_ambient
+
+    # -------------------------
+    # Region files
+    # -------------------------
+
+    def item_region(self, item_id: str) -> Optional[str]:
+        """
+        Region whose file places `item_id`. Regions not read yet are
+        scanned on a miss (once per scenario, e.g. when a campaign
+        resumes holding items from far-away regions).
+        """
+        region = self._item_regions.get(item_id)
+        if region is not None:
+            return region
+        for region in self.region_ids():
+            if region in self._indexed_regions:
+                continue
+            self.region_spec(region)
+            if item_id in self._item_regions:
+                return self._item_regions[item_id]
+        return None
+
+    def item_start(self, world: World, ref: str) -> Optional[Tuple[Item, str, str]]:
+        # items of loaded regions are in the session's item index already;
+        # this covers regions no player has been near (or that were
+        # dropped before a campaign resume rebuilt the index)
+        key = ref.strip().lower()
+        item_id = key
+        region = self.item_region(key)
+        if region is None:
+            # the miss above has read every region, so names are complete
+            item_id = self._item_names.get(key, "")
+            region = self._item_regions.get(item_id)
+        if region is None or (isinstance(world, RegionalWorld) and region in world.regions):
+            return None
+
+        spec = self.cached_spec(region)
+        if spec is None:
+            return None
+        for iid, name, desc, tags, room_id in spec.items:
+            if iid == item_id:
+                item = Item(id=iid, name=name, description=desc, tags=list(tags))
+                return item, room_id, world.room_name(room_id) or room_id
+        return None
+
+    def cached_spec(self, region: str) -> Optional[RegionSpec]:
+        """
+        Spec for a region that has already been read, without checking the
+        file for changes; falls back to region_spec() on a cache miss.
+        Returns None for regions that do not exist.
+        """
+        cached = self._specs.get(region)
+        if cached is not None:
+            return cached[1]
+        if not self.has_region(region):
+            return None
+        return self.region_spec(region)
+
+    def region_spec(self, region: str) -> RegionSpec:
+        """
+        Parsed region file, re-read if it changed on disk. Called when a
+        region is loaded into a world.
+        """
+        path = self.regions_dir / f"{region}.yaml"
+        if not self.has_region(region):
+            raise FileNotFoundError(f"Missing region file: {path}")
+
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._specs.get(region)
+        if cached is not None and cached[0] == mtime_ns:
+            self._specs.move_to_end(region)
+            return cached[1]
+
+        with path.open("r", encoding="utf-8") as f:
+            # regions load mid-game, so use libyaml when it is available
+            doc = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))  # type: ignore
+        if doc is None:
+            doc = {}
+        if not isinstance(doc, dict):
+            raise ValueError(f"YAML root must be a mapping in {path}")
+
+        spec = self._parse_region(region, doc)
+        for item_id, name, _, _, _ in spec.items:
+            self._item_regions[item_id] = region
+            self._item_names.setdefault(name.lower(), item_id)
+        self._indexed_regions.add(region)
+        self._specs[region] = (mtime_ns, spec)
+        self._specs.move_to_end(region)
+        while len(self._specs) > SPEC_CACHE_SIZE:
+            self._specs.popitem(last=False)
+        return spec
+
+    def _parse_region(self, region: str, doc: Dict[str, Any]) -> RegionSpec:
+        where = f"regions/{region}.yaml"
+
+        rooms_raw = doc.get("rooms", [])
+        if not isinstance(rooms_raw, list):
+            raise ValueError(f"{where}: 'rooms' must be a list")
+
+        def qualify(ref: Any) -> str:
+            ref = str(ref).strip().lower()
+            return ref if "/" in ref else f"{region}/{ref}"
+
+        rooms: List[Tuple[str, str, str, str]] = []
+        room_ids: Set[str] = set()
+        room_ambient: Dict[str, AliasTable] = {}
+        for r in rooms_raw:
+            if not isinstance(r, dict):
+                raise ValueError(f"{where}: each room must be a mapping")
+            local = str(r.get("id", "")).strip().lower()
+            if not local or "/" in local:
+                raise ValueError(f"{where}: room needs a non-empty 'id' without '/'")
+            rid = f"{region}/{local}"
+            rooms.append((
+                rid,
+                str(r.get("name", local)),
+                str(r.get("description", "")),
+                str(r.get("detail_description", "")),
+            ))
+            room_ids.add(rid)
+            if r.get("ambient") is not None:
+                room_ambient[rid] = parse_ambient_table(r["ambient"], f"{where}: room '{local}'")
+
+        exits: List[Tuple[str, str]] = []
+        borders: List[Tuple[str, str]] = []
+        connected: Set[frozenset[str]] = set()
+        for r in rooms_raw:
+            rid = f"{region}/{str(r.get('id', '')).strip().lower()}"
+            exits_raw = r.get("exits", {})
+            if exits_raw is None:
+                exits_raw = {}
+            if not isinstance(exits_raw, dict):
+                raise ValueError(f"{where}: room '{rid}' exits must be a mapping")
+            for _, dest in exits_raw.items():
+                if not str(dest).strip():
+                    continue
+                dest_id = qualify(dest)
+                dest_region = region_of(dest_id)
+                if dest_region != region:
+                    if not self.has_region(dest_region):
+                        raise ValueError(f"{where}: room '{rid}' exit points to unknown region '{dest_region}'")
+                    borders.append((rid, dest_id))
+                    continue
+                if dest_id not in room_ids:
+                    raise ValueError(f"{where}: room '{rid}' exit points to missing room id '{dest_id}'")
+                edge = frozenset([rid, dest_id])
+                if edge in connected:
+                    continue
+                exits.append((rid, dest_id))
+                connected.add(edge)
+
+        items_raw = doc.get("items", [])
+        if items_raw is None:
+            items_raw = []
+        if not isinstance(items_raw, list):
+            raise ValueError(f"{where}: 'items' must be a list")
+
+        items: List[Tuple[str, str, str, Tuple[str, ...], str]] = []
+        for it in items_raw:
+            if not isinstance(it, dict):
+                raise ValueError(f"{where}: each item must be a mapping")
+            item_id = str(it.get("id", "")).strip().lower()
+            if not item_id:
+                raise ValueError(f"{where}: item missing non-empty 'id'")
+            tags_raw = it.get("tags", [])
+            if tags_raw is None:
+                tags_raw = []
+            if not isinstance(tags_raw, list):
+                raise ValueError(f"{where}: item '{item_id}' tags must be a list")
+            if not str(it.get("location", "")).strip():
+                raise ValueError(f"{where}: item '{item_id}' missing 'location'")
+            loc_id = qualify(it["location"])
+            if loc_id not in room_ids:
+                raise ValueError(f"{where}: item '{item_id}' location '{loc_id}' is not a room of this region")
+            items.append((
+                item_id,
+                str(it.get("name", item_id)),
+                str(it.get("description", "")),
+                tuple(str(t) for t in tags_raw),
+                loc_id,
+            ))
+
+        ambient = None
+        if doc.get("ambient") is not None:
+            ambient = parse_ambient_table(doc["ambient"], where)
+
+        return RegionSpec(
+            id=region,
+            rooms=tuple(rooms),
+            exits=tuple(exits),
+            borders=tuple(borders),
+            items=tuple(items),
+            ambient=ambient,
+            room_ambient=room_ambient,
+        )
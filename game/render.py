@@ -0,0 +1,96 @@
+# game/render.py
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+import textwrap
+
+from .world import Location, World
+
+
+def wrap_text(text: str, width: Optional[int]) -> str:
+    """
+    Wrap each line of `text` to `width` columns, keeping existing line
+    breaks (YAML block scalars rely on them). width=None leaves text as-is.
+    """
+    if not width:
+        return text
+    return "\n".join(
+        textwrap.fill(line, width=width) if line else line
+        for line in text.split("\n")
+    )
+
+
+class RoomRenderCache:
+    """
+    Memoized room text for describe_surroundings and look.
+
+    Each room keeps one entry holding the Location.version it was rendered
+    at; a room is re-rendered only after its items or exits change, and
+    the new text replaces the old. Per-player lines (names, inventory,
+    other occupants) are added by the caller.
+
+    One cache per engine: versions count changes within a session, so the
+    same (room, version) in two sessions can mean different items.
+    """
+
+    def __init__(self, width: Optional[int] = None) -> None:
+        self.width = width
+        self._glances: Dict[Tuple[str, bool], Tuple[int, str]] = {}
+        self._looks: Dict[str, Tuple[int, str]] = {}
+
+    def glance(self, loc: Location, inspected: bool) -> str:
+        key = (loc.id, inspected)
+        cached = self._glances.get(key)
+        if cached is not None and cached[0] == loc.version:
+            return cached[1]
+
+        if inspected:
+            text = (loc.detail_description or "").strip()
+            if not text:
+                text = (loc.description or "").strip()
+        else:
+            text = (loc.description or "").strip()
+        text = wrap_text(text, self.width)
+        self._glances[key] = (loc.version, text)
+        return text
+
+    def look(self, loc: Location, world: World) -> str:
+        cached = self._looks.get(loc.id)
+        if cached is not None and cached[0] == loc.version:
+            return cached[1]
+
+        text = wrap_text(self._render_look(loc, world), self.width)
+        self._looks[loc.id] = (loc.version, text)
+        return text
+
+    def _render_look(self, loc: Location, world: World) -> str:
+        detail = (loc.detail_description or "").strip()
+        if not detail:
+            detail = "You don't notice anything new."
+
+        desc_lines = [
+            f"You take a careful look around {loc.name}.",
+            detail,
+        ]
+
+        if loc.neighbors:
+            neighbor_names = []
+            for nid in loc.neighbors:
+                nloc = world.get_location(nid)
+                if nloc:
+                    neighbor_names.append(f"{nloc.name} ({nid})")
+                else:
+                    neighbor_names.append(nid)
+            neighbors_str = ", ".join(neighbor_names)
+            desc_lines.append(f"Exits lead to: {neighbors_str}.")
+
+        if loc.items:
+            item_list = ", ".join(item.name for item in loc.items)
+            desc_lines.append(f"On closer inspection, you notice: {item_list} on the ground.")
+        else:
+            desc_lines.append("You don't see anything obviously useful, just the unsettling details of the room.")
+
+        return "\n".join(desc_lines)
+
+    def clear(self) -> None:
+        self._glances.clear()
+        self._looks.clear()
@@ -1,14 +1,19 @@
 # game/scenario.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .entities import Item
     from .game_state import GameState
+    from .ambient import AliasTable
+    from .text_index import TextIndex
+    from .world import World
 
 
 class Scenario(ABC):
     name: str
+    _text_index: Optional["TextIndex"] = None
 
     @abstractmethod
     def initial_setup(self, state: "GameState") -> None:
@@ -21,3 +26,41 @@ class Scenario(ABC):
         """
         ...
 
+    def win_message(self, winner_id: str) -> str:
+        """
+        Text shown when check_win_condition reports `winner_id`.
+        """
+        if winner_id == "BOTH":
+            return "You find each other in the darkness. For now, you are safe."
+        return f"Player {winner_id} has won."
+
+    def ambient_table(self, room_id: str) -> Optional["AliasTable"]:
+        """
+        Ambient event table for a room, or None to use the engine default.
+        """
+        return None
+
+    def item_start(self, world: "World", ref: str) -> Optional[Tuple["Item", str, str]]:
+        """
+        (item, room id, room name) where the scenario first places an item
+        that is not in the world yet, by id or name. Scenarios that load
+        every item up front have none.
+        """
+        return None
+
+    @property
+    def realtime(self) -> Dict[str, Any]:
+        """
+        Raw real-time settings (see game.realtime.RealtimeConfig).
+        """
+        return {}
+
+    def text_index(self, world: "World") -> "TextIndex":
+        """
+        Inverted index over room and item text. Built on first use and
+        shared by every session set up from this scenario instance.
+        """
+        if self._text_index is None:
+            from .text_index import TextIndex
+            self._text_index = TextIndex.from_world(world)
+        return self._text_index
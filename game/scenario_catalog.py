@@ -0,0 +1,207 @@
+# game/scenario_catalog.py
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import os
+
+try:
+    import yaml  # type: ignore
+except Exception as e:  # pragma: no cover
+    yaml = None
+    _yaml_import_error = e
+
+
+DEFAULT_ROOTS = ("dev",)
+DEFAULT_INDEX_PATH = "dev/.scenario_index.json"
+SCENARIO_PREFIX = "scenario_"
+
+# bump when the shape of an index entry changes
+_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ScenarioEntry:
+    key: str          # folder name without the scenario_ prefix, e.g. "manor"
+    path: str         # scenario directory
+    mtime_ns: int     # rooms.yaml mtime the header was read at
+    name: str
+    mode: str
+    intro: str
+
+
+def read_scenario_header(rooms_path: Path) -> Dict[str, Any]:
+    """
+    Parse only the top-level `scenario:` block of a rooms.yaml.
+
+    The block ends at the next top-level key, so the (possibly huge) room
+    list is never handed to the YAML parser.
+    """
+    if yaml is None:  # pragma: no cover
+        raise RuntimeError(
+            "PyYAML is not installed. Install it with: pip install pyyaml"
+        ) from _yaml_import_error
+
+    block: List[str] = []
+    in_block = False
+    with rooms_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            top_level = bool(line.strip()) and not line[0].isspace() and not line.startswith("#")
+            if not in_block:
+                if top_level and line.split(":", 1)[0].strip() == "scenario":
+                    in_block = True
+                    block.append(line)
+                continue
+            if top_level:
+                break
+            block.append(line)
+
+    if not block:
+        return {}
+
+    data = yaml.safe_load("".join(block))  # type: ignore
+    if not isinstance(data, dict):
+        return {}
+    scen = data.get("scenario")
+    return scen if isinstance(scen, dict) else {}
+
+
+class ScenarioCatalog:
+    """
+    Index of every scenario_* folder under the configured roots.
+
+    Only scenario headers are read, and results are persisted to a JSON
+    index keyed by rooms.yaml mtime, so listing stays cheap with hundreds
+    of scenarios. Full loading is left to YamlScenario once one is chosen.
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[str] = DEFAULT_ROOTS,
+        index_path: Optional[str] = DEFAULT_INDEX_PATH,
+    ) -> None:
+        self.roots = [Path(r) for r in roots]
+        self.index_path = Path(index_path) if index_path else None
+        self._entries: Dict[str, ScenarioEntry] = {}
+        self._loaded = False
+
+    def refresh(self) -> None:
+        cached = self._read_index()
+        entries: Dict[str, ScenarioEntry] = {}
+        changed = False
+
+        for scen_dir in self._scan():
+            rooms_path = scen_dir / "rooms.yaml"
+            try:
+                mtime_ns = rooms_path.stat().st_mtime_ns
+            except OSError:
+                continue
+
+            key = scen_dir.name[len(SCENARIO_PREFIX):]
+            if key in entries:
+                # earlier roots win on name clashes
+                continue
+
+            path = str(scen_dir)
+            hit = cached.get(path)
+            if hit is not None and hit.mtime_ns == mtime_ns:
+                entries[key] = hit
+                continue
+
+            header = read_scenario_header(rooms_path)
+            entries[key] = ScenarioEntry(
+                key=key,
+                path=path,
+                mtime_ns=mtime_ns,
+                name=str(header.get("name", scen_dir.name)),
+                mode=str(header.get("mode", "meet")),
+                intro=str(header.get("intro", "")).rstrip(),
+            )
+            changed = True
+
+        if changed or len(entries) != len(cached):
+            self._write_index(entries.values())
+
+        self._entries = entries
+        self._loaded = True
+
+    def entries(self) -> List[ScenarioEntry]:
+        self._ensure_loaded()
+        return sorted(self._entries.values(), key=lambda e: e.key)
+
+    def search(self, query: str) -> List[ScenarioEntry]:
+        q = query.strip().lower()
+        if not q:
+            return self.entries()
+        return [
+            e for e in self.entries()
+            if q in e.key.lower() or q in e.name.lower() or q in e.mode.lower() or q in e.intro.lower()
+        ]
+
+    def resolve(self, name: str) -> Optional[ScenarioEntry]:
+        """
+        Find a scenario by folder key (e.g. "manor") or by its display name.
+        """
+        self._ensure_loaded()
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        lowered = name.strip().lower()
+        for e in self._entries.values():
+            if e.key.lower() == lowered or e.name.lower() == lowered:
+                return e
+        return None
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.refresh()
+
+    def _scan(self) -> Iterable[Path]:
+        for root in self.roots:
+            try:
+                children = sorted(os.scandir(root), key=lambda d: d.name)
+            except OSError:
+                continue
+            for child in children:
+                if child.name.startswith(SCENARIO_PREFIX) and child.is_dir():
+                    yield Path(child.path)
+
+    def _read_index(self) -> Dict[str, ScenarioEntry]:
+        if self.index_path is None or not self.index_path.exists():
+            return {}
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if doc.get("version") != _INDEX_VERSION:
+                return {}
+            return {e["path"]: ScenarioEntry(**e) for e in doc.get("entries", [])}
+        except (OSError, ValueError, TypeError, KeyError):
+            # a corrupt index is just a cold cache
+            return {}
+
+    def _write_index(self, entries: Iterable[ScenarioEntry]) -> None:
+        if self.index_path is None:
+            return
+        doc = {"version": _INDEX_VERSION, "entries": [asdict(e) for e in entries]}
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(doc, f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            # read-only checkout: the catalog still works, just uncached
+            pass
+
+
+def catalog_roots(extra_roots: Iterable[str] = ()) -> List[str]:
+    """
+    Default roots, then SCENARIO_ROOTS (os.pathsep-separated), then `extra_roots`.
+    """
+    roots = list(DEFAULT_ROOTS)
+    env = os.environ.get("SCENARIO_ROOTS", "")
+    roots.extend(r for r in env.split(os.pathsep) if r)
+    roots.extend(extra_roots)
+    return roots
@@ -74,23 +74,14 @@ class FindEachOtherScenario(Scenario):
 
         state.world = world
 
-        p1 = state.players["P1"]
-        p2 = state.players["P2"]
-
-        p1.location_id = "foyer"
-        p2.location_id = "library"
+        state.move_player("P1", "foyer")
+        state.move_player("P2", "library")
 
         state.add_message("You awaken in different parts of a strange place.")
         state.add_message("Find each other before the darkness finds you.")
 
     def check_win_condition(self, state: GameState) -> Optional[str]:
-        players = list(state.players.values())
-        if len(players) < 2:
-            return None
-
-        p1, p2 = players[0], players[1]
-        if p1.location_id == p2.location_id:
+        if state.occupancy.all_together(len(state.players)):
             return "BOTH"
-
         return None
 
@@ -0,0 +1,574 @@
+# game/shared_world.py
+"""
+Compiled scenario data in shared memory, for multi-worker hosting.
+
+A parent process parses a scenario once and publishes it:
+
+    data = publish_scenario("dev/scenario_maze")
+    ...start workers, passing data.name...
+    data.close(); data.unlink()
+
+Each worker attaches read-only and builds sessions from it:
+
+    scenario = SharedScenario.attach(name)
+    engine = GameEngine(state, scenario)
+
+Room lookup (binary search over sorted ids) and adjacency (CSR arrays)
+read the shared buffer directly. A session only materializes Location
+objects for rooms it actually touches, so an extra worker costs its own
+session state rather than another copy of the world. The recall index is
+compiled into the buffer too; snippets are decoded only for the hits.
+"""
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import bisect
+import json
+import os
+import struct
+import sys
+
+from .entities import Item
+from .text_index import DocKey, TextIndex
+from .world import Location, World
+from .yaml_scenario import ScenarioConfig, YamlScenario
+
+
+_MAGIC = b"AZW2"
+# magic, n_rooms, n_edges, n_items, n_tokens, n_docs, meta_off, meta_len,
+# rooms_off, adj_off, items_off, item_order_off, tokens_off, post_docs_off,
+# post_tfs_off, strings_off
+_HEADER = struct.Struct("<4s15I")
+
+# per room: id, name, description, detail, region as (offset, length) pairs,
+# then adjacency [start, end) and item [start, end)
+_ROOM_FIELDS = 14
+# per item: id, name, description, tags as (offset, length) pairs, then room index
+_ITEM_FIELDS = 9
+# per token (sorted): token as (offset, length), then postings [start, end)
+_TOKEN_FIELDS = 4
+
+_TAG_SEP = "\x1f"
+
+
+def compile_world(world: World, meta: Dict[str, Any]) -> bytes:
+    """
+    Flatten a World (plus JSON-able scenario metadata) into one buffer.
+    All integers are little-endian u32; strings are UTF-8 in one pool.
+    """
+    ids = sorted(world.locations)
+    index = {rid: i for i, rid in enumerate(ids)}
+
+    pool = bytearray()
+
+    def put(text: str) -> Tuple[int, int]:
+        raw = text.encode("utf-8")
+        off = len(pool)
+        pool.extend(raw)
+        return off, len(raw)
+
+    rooms: List[int] = []
+    adjacency: List[int] = []
+    items: List[int] = []
+    item_ids: List[str] = []
+    for rid in ids:
+        loc = world.locations[rid]
+        adj_start = len(adjacency)
+        adjacency.extend(sorted(index[n] for n in loc.neighbors if n in index))
+        item_start = len(items) // _ITEM_FIELDS
+        for item in loc.items:
+            for text in (item.id, item.name, item.description, _TAG_SEP.join(item.tags)):
+                items.extend(put(text))
+            items.append(index[rid])
+            item_ids.append(item.id)
+        for text in (loc.id, loc.name, loc.description, loc.detail_description, loc.region):
+            rooms.extend(put(text))
+        rooms.extend((adj_start, len(adjacency), item_start, len(items) // _ITEM_FIELDS))
+    item_order = sorted(range(len(item_ids)), key=item_ids.__getitem__)
+
+    # recall index, documents numbered rooms, then details, then items
+    text_index = TextIndex.from_world(world)
+    item_docs: Dict[str, int] = {}
+    for k, j in enumerate(item_order):
+        item_docs.setdefault(item_ids[j], 2 * len(ids) + k)
+    doc_base = {"room": 0, "detail": len(ids)}
+
+    def doc_number(key: DocKey) -> int:
+        kind, ref = key
+        if kind == "item":
+            return item_docs[ref]
+        return doc_base[kind] + index[ref]
+
+    tokens: List[int] = []
+    post_docs: List[int] = []
+    post_tfs: List[int] = []
+    for tok in sorted(text_index.postings):
+        start = len(post_docs)
+        for doc, tf in sorted((doc_number(key), tf) for key, tf in text_index.postings[tok].items()):
+            post_docs.append(doc)
+            post_tfs.append(tf)
+        tokens.extend(put(tok))
+        tokens.extend((start, len(post_docs)))
+
+    meta_off, meta_len = put(json.dumps(meta))
+
+    rooms_off = _HEADER.size
+    adj_off = rooms_off + 4 * len(rooms)
+    items_off = adj_off + 4 * len(adjacency)
+    item_order_off = items_off + 4 * len(items)
+    tokens_off = item_order_off + 4 * len(item_order)
+    post_docs_off = tokens_off + 4 * len(tokens)
+    post_tfs_off = post_docs_off + 4 * len(post_docs)
+    strings_off = post_tfs_off + 4 * len(post_tfs)
+
+    header = _HEADER.pack(
+        _MAGIC, len(ids), len(adjacency), len(items) // _ITEM_FIELDS,
+        len(tokens) // _TOKEN_FIELDS, len(text_index), meta_off, meta_len,
+        rooms_off, adj_off, items_off, item_order_off, tokens_off, post_docs_off,
+        post_tfs_off, strings_off,
+    )
+    blob = bytearray(header)
+    for arr in (rooms, adjacency, items, item_order, tokens, post_docs, post_tfs):
+        blob.extend(struct.pack(f"<{len(arr)}I", *arr))
+    blob.extend(pool)
+    return bytes(blob)
+
+
+class SharedScenarioData:
+    """
+    Read-only view over a compiled scenario buffer (shared memory or bytes).
+    """
+
+    def __init__(self, buf: memoryview, shm: Optional[SharedMemory] = None, owner: bool = False) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.buf = buf
+
+        (magic, self.n_rooms, n_edges, self.n_items, self.n_tokens, self.n_docs, meta_off, meta_len,
+         rooms_off, adj_off, items_off, item_order_off, tokens_off, post_docs_off,
+         post_tfs_off, self._strings_off) = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            raise ValueError("shared scenario buffer has an unknown format")
+
+        # zero-copy u32 views into the buffer
+        self._rooms = buf[rooms_off:adj_off].cast("I")
+        self._adj = buf[adj_off:items_off].cast("I")
+        self._items = buf[items_off:item_order_off].cast("I")
+        self._item_order = buf[item_order_off:tokens_off].cast("I")
+        self._tokens = buf[tokens_off:post_docs_off].cast("I")
+        self.post_docs = buf[post_docs_off:post_tfs_off].cast("I")
+        self.post_tfs = buf[post_tfs_off:self._strings_off].cast("I")
+        self.meta: Dict[str, Any] = json.loads(self._text(meta_off, meta_len))
+
+    @property
+    def name(self) -> str:
+        if self._shm is None:
+            raise ValueError("data is not in shared memory")
+        return self._shm.name
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    @classmethod
+    def create(cls, blob: bytes, name: Optional[str] = None) -> "SharedScenarioData":
+        shm = SharedMemory(name=name, create=True, size=len(blob))
+        shm.buf[: len(blob)] = blob
+        return cls(shm.buf[: len(blob)], shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedScenarioData":
+        shm = _attach_untracked(name)
+        return cls(shm.buf.toreadonly(), shm)
+
+    def close(self) -> None:
+        views = (self._rooms, self._adj, self._items, self._item_order, self._tokens, self.post_docs, self.post_tfs)
+        for view in (*views, self.buf):
+            view.release()
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        if self._shm is not None and self._owner:
+            self._shm.unlink()
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+
+    def _text(self, off: int, length: int) -> str:
+        start = self._strings_off + off
+        return str(self.buf[start:start + length], "utf-8")
+
+    def _room_field(self, i: int, field: int) -> str:
+        base = i * _ROOM_FIELDS + 2 * field
+        return self._text(self._rooms[base], self._rooms[base + 1])
+
+    def room_id(self, i: int) -> str:
+        return self._room_field(i, 0)
+
+    def room_index(self, room_id: str) -> int:
+        """
+        Index of a room id, or -1. Binary search over the sorted id table.
+        """
+        return self._find(room_id, self.n_rooms, self._rooms, _ROOM_FIELDS)
+
+    def item_rank(self, item_id: str) -> int:
+        """
+        Position of an item id in id order, or -1.
+        """
+        return self._find(item_id, self.n_items, self._items, _ITEM_FIELDS, self._item_order)
+
+    def item_by_rank(self, k: int) -> int:
+        """
+        Item index of the k-th item in id order.
+        """
+        return self._item_order[k]
+
+    def postings(self, token: str) -> Optional[Tuple[int, int]]:
+        """
+        [start, end) of a token's slice of post_docs / post_tfs, or None.
+        """
+        k = self._find(token, self.n_tokens, self._tokens, _TOKEN_FIELDS)
+        if k < 0:
+            return None
+        base = k * _TOKEN_FIELDS
+        return self._tokens[base + 2], self._tokens[base + 3]
+
+    def _find(self, text: str, n: int, table: memoryview, stride: int, order: Optional[memoryview] = None) -> int:
+        """
+        Binary search for `text` among n sorted strings whose (offset, length)
+        pairs start every `stride` entries of `table`, taken in `order` if
+        the table itself is not sorted.
+        """
+        key = text.encode("utf-8")
+        lo, hi = 0, n
+        buf, strings = self.buf, self._strings_off
+        while lo < hi:
+            mid = (lo + hi) // 2
+            base = (mid if order is None else order[mid]) * stride
+            off = strings + table[base]
+            probe = buf[off:off + table[base + 1]].tobytes()
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def room_name(self, i: int) -> str:
+        return self._room_field(i, 1)
+
+    def room_text(self, i: int, detail: bool = False) -> str:
+        return self._room_field(i, 3 if detail else 2)
+
+    def neighbors(self, i: int) -> memoryview:
+        base = i * _ROOM_FIELDS
+        return self._adj[self._rooms[base + 10]:self._rooms[base + 11]]
+
+    def room(self, i: int) -> Tuple[str, str, str, str, str]:
+        """
+        (id, name, description, detail_description, region)
+        """
+        return tuple(self._room_field(i, f) for f in range(5))  # type: ignore[return-value]
+
+    def room_items(self, i: int) -> range:
+        base = i * _ROOM_FIELDS
+        return range(self._rooms[base + 12], self._rooms[base + 13])
+
+    def item(self, j: int) -> Tuple[str, str, str, List[str], int]:
+        """
+        (id, name, description, tags, room index)
+        """
+        base = j * _ITEM_FIELDS
+        v = self._items
+        tags = self._text(v[base + 6], v[base + 7])
+        return (
+            self._text(v[base], v[base + 1]),
+            self._text(v[base + 2], v[base + 3]),
+            self._text(v[base + 4], v[base + 5]),
+            tags.split(_TAG_SEP) if tags else [],
+            v[base + 8],
+        )
+
+
+# pid of the process whose own resource tracker we started by attaching
+_own_tracker_pid: Optional[int] = None
+
+
+def _attach_untracked(name: str) -> SharedMemory:
+    """
+    Open an existing segment without letting this process's resource
+    tracker adopt it: only the publisher owns the segment.
+
+    Python 3.13+ has track=False. Before that, attaching registers the
+    segment with the resource tracker, which unlinks it when its process
+    exits. Multiprocessing children (fork or spawn) inherit the parent's
+    tracker, and the parent's registration must stay, so only a tracker
+    this process started itself is told to forget the segment.
+    """
+    global _own_tracker_pid
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+
+    tracker = resource_tracker._resource_tracker  # type: ignore[attr-defined]
+    # no tracker yet (not inherited, not started here): attaching starts one
+    fresh = getattr(tracker, "_fd", None) is None
+    shm = SharedMemory(name=name)
+    if fresh:
+        _own_tracker_pid = os.getpid()
+    if _own_tracker_pid == os.getpid():
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        except Exception:  # pragma: no cover
+            pass
+    return shm
+
+
+class _SharedLocations(MutableMapping):
+    """
+    World.locations for a SharedWorld: membership and iteration read the
+    shared buffer; a Location object is created the first time a room is
+    fetched and then belongs to this session.
+    """
+
+    def __init__(self, world: "SharedWorld") -> None:
+        self._world = world
+        self._data = world.data
+        self.materialized: Dict[str, Location] = {}
+
+    def __getitem__(self, room_id: str) -> Location:
+        loc = self.materialized.get(room_id)
+        if loc is not None:
+            return loc
+        i = self._data.room_index(room_id)
+        if i < 0:
+            raise KeyError(room_id)
+        loc = self._world._materialize(i)
+        self.materialized[room_id] = loc
+        return loc
+
+    def __contains__(self, room_id: object) -> bool:
+        if room_id in self.materialized:
+            return True
+        return isinstance(room_id, str) and self._data.room_index(room_id) >= 0
+
+    def __setitem__(self, room_id: str, loc: Location) -> None:
+        self.materialized[room_id] = loc
+
+    def __delitem__(self, room_id: str) -> None:
+        del self.materialized[room_id]
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._data.n_rooms):
+            yield self._data.room_id(i)
+
+    def __len__(self) -> int:
+        return self._data.n_rooms
+
+
+class SharedWorld(World):
+    """
+    Per-session World over SharedScenarioData. Topology and text stay in
+    shared memory; only touched rooms and the item placements are local.
+    """
+
+    def __init__(self, data: SharedScenarioData) -> None:
+        self.data = data
+        self.locations = _SharedLocations(self)  # type: ignore[assignment]
+        # items of rooms not materialized yet, by room index
+        self._pending_items: Dict[int, List[Item]] = {}
+        for j in range(data.n_items):
+            item_id, name, desc, tags, room = data.item(j)
+            self._pending_items.setdefault(room, []).append(
+                Item(id=item_id, name=name, description=desc, tags=tags)
+            )
+
+    def get_location(self, location_id: str) -> Optional[Location]:
+        try:
+            return self.locations[location_id]
+        except KeyError:
+            return None
+
+    def placed_items(self) -> Iterator[Tuple[str, Item]]:
+        for loc in self.locations.materialized.values():  # type: ignore[attr-defined]
+            for item in loc.items:
+                yield loc.id, item
+        for i, items in self._pending_items.items():
+            room_id = self.data.room_id(i)
+            for item in items:
+                yield room_id, item
+
+    def _materialize(self, i: int) -> Location:
+        room_id, name, desc, detail, region = self.data.room(i)
+        return Location(
+            id=room_id,
+            name=name,
+            description=desc,
+            detail_description=detail,
+            region=region,
+            neighbors={self.data.room_id(n) for n in self.data.neighbors(i)},
+            items=self._pending_items.pop(i, []),
+        )
+
+
+class SharedScenario(YamlScenario):
+    """
+    YamlScenario whose compiled data comes from shared memory instead of
+    the scenario files.
+    """
+
+    def __init__(self, data: SharedScenarioData) -> None:
+        super().__init__(data.meta.get("scenario_dir", ""))
+        self.data = data
+        self._ambient_loaded = False
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedScenario":
+        return cls(SharedScenarioData.attach(name))
+
+    def _load(self) -> Tuple[ScenarioConfig, World]:
+        cfg = self.data.meta["config"]
+        config = ScenarioConfig(
+            name=cfg["name"], mode=cfg["mode"], starts=dict(cfg["starts"]), intro=cfg["intro"],
+            realtime=dict(cfg.get("realtime", {})),
+        )
+        world = SharedWorld(self.data)
+        if not self._ambient_loaded:
+            self._ambient_loaded = True
+            self._default_ambient, self._ambient = self._parse_ambient(
+                self.data.meta["ambient"],
+                ((self.data.room_id(i), self.data.room(i)[4]) for i in range(self.data.n_rooms)),
+            )
+        return config, world
+
+    def _default_start(self, world: World) -> str:
+        # shared rooms iterate in sorted order; use the file order's first room
+        return self.data.meta["first_room"]
+
+    def text_index(self, world: World) -> TextIndex:
+        # compiled into the shared buffer, never built from session Locations
+        if self._text_index is None:
+            self._text_index = SharedTextIndex(self.data)
+        return self._text_index
+
+
+class _SharedPostings:
+    """
+    One token's postings in the shared buffer: doc numbers in ascending
+    order with their weighted term frequencies.
+    """
+
+    def __init__(self, data: SharedScenarioData, start: int, end: int) -> None:
+        self._docs = data.post_docs
+        self._tfs = data.post_tfs
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._docs[self._start:self._end])
+
+    def get(self, doc: int) -> Optional[int]:
+        i = bisect.bisect_left(self._docs, doc, self._start, self._end)
+        if i < self._end and self._docs[i] == doc:
+            return self._tfs[i]
+        return None
+
+
+class SharedTextIndex(TextIndex):
+    """
+    TextIndex over the postings compile_world() put in the shared buffer.
+    Documents are numbers: room i is i, its detail n_rooms + i and the k-th
+    item in id order 2 * n_rooms + k. Names and snippets are decoded only
+    for hits.
+    """
+
+    def __init__(self, data: SharedScenarioData) -> None:
+        super().__init__()
+        self.data = data
+
+    def __len__(self) -> int:
+        return self.data.n_docs
+
+    # the compiled index already covers every room and item
+    def add_location(self, loc: Location) -> None:
+        pass
+
+    def add_item(self, item: Item) -> None:
+        pass
+
+    def _postings(self, token: str) -> Optional[_SharedPostings]:  # type: ignore[override]
+        span = self.data.postings(token)
+        return None if span is None else _SharedPostings(self.data, *span)
+
+    def _doc(self, kind: str, ref: str) -> Optional[int]:
+        n = self.data.n_rooms
+        if kind == "item":
+            k = self.data.item_rank(ref)
+            return None if k < 0 else 2 * n + k
+        i = self.data.room_index(ref)
+        if i < 0:
+            return None
+        return i if kind == "room" else n + i
+
+    def _key(self, doc: int) -> DocKey:
+        n = self.data.n_rooms
+        if doc >= 2 * n:
+            return "item", self.data.item(self.data.item_by_rank(doc - 2 * n))[0]
+        return ("room" if doc < n else "detail"), self.data.room_id(doc % n)
+
+    def _order(self, doc: int) -> int:
+        return doc
+
+    def _name(self, doc: int) -> str:
+        n = self.data.n_rooms
+        if doc >= 2 * n:
+            return self.data.item(self.data.item_by_rank(doc - 2 * n))[1]
+        return self.data.room_name(doc % n)
+
+    def _doc_texts(self, doc: int) -> Tuple[str, ...]:
+        n = self.data.n_rooms
+        if doc >= 2 * n:
+            return (self.data.item(self.data.item_by_rank(doc - 2 * n))[2],)
+        return (self.data.room_text(doc % n, detail=doc >= n),)
+
+
+def publish_scenario(scenario_dir: str, name: Optional[str] = None) -> SharedScenarioData:
+    """
+    Parse a YAML scenario once and place it in a new shared memory segment.
+    The caller owns the segment and must close() and unlink() it.
+    """
+    scenario = YamlScenario(scenario_dir)
+    config, world = scenario._load()
+    rooms_doc = scenario._load_yaml(scenario.scenario_dir / "rooms.yaml")
+
+    # only the parts _parse_ambient reads
+    ambient_doc = {
+        "scenario": {"ambient": (rooms_doc.get("scenario") or {}).get("ambient")},
+        "regions": rooms_doc.get("regions") or {},
+        "rooms": [
+            {"id": r.get("id"), "ambient": r["ambient"]}
+            for r in rooms_doc.get("rooms", [])
+            if isinstance(r, dict) and r.get("ambient") is not None
+        ],
+    }
+    meta = {
+        "scenario_dir": str(scenario_dir),
+        "config": {
+            "name": config.name,
+            "mode": config.mode,
+            "starts": config.starts,
+            "intro": config.intro,
+            "realtime": config.realtime,
+        },
+        "ambient": ambient_doc,
+        "first_room": next(iter(world.locations), ""),
+    }
+    return SharedScenarioData.create(compile_world(world, meta), name=name)
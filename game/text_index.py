@@ -0,0 +1,192 @@
+# game/text_index.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+import heapq
+import math
+import re
+
+from .entities import Item
+from .world import Location, World
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# name hits count more than description hits
+NAME_WEIGHT = 3
+
+# ("room" | "detail" | "item", id); a room's detail_description is its own
+# document, so recall can tell a glance from a careful look
+DocKey = Tuple[str, str]
+_KIND_ORDER = {"room": 0, "detail": 1, "item": 2}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class Hit:
+    kind: str      # "room" (description or detail) or "item"
+    id: str
+    name: str
+    snippet: str
+    score: float
+
+
+class TextIndex:
+    """
+    Inverted index: token -> {(kind, id): weighted term frequency}.
+
+    Built once per scenario; queries touch only the postings of the query
+    tokens, so they do not grow with the number of rooms.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[DocKey, int]] = {}
+        self._names: Dict[DocKey, str] = {}
+        self._texts: Dict[DocKey, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_world(cls, world: World, extra_items: Iterable[Item] = ()) -> "TextIndex":
+        index = cls()
+        for loc in world.locations.values():
+            index.add_location(loc)
+        for _, item in world.placed_items():
+            index.add_item(item)
+        for item in extra_items:
+            index.add_item(item)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add_location(self, loc: Location) -> None:
+        self.add_room(loc.id, loc.name, loc.description, loc.detail_description)
+
+    def add_room(self, room_id: str, name: str, description: str, detail_description: str = "") -> None:
+        self._add(("room", room_id), name, (description,))
+        if detail_description.strip():
+            self._add(("detail", room_id), name, (detail_description,), name_weight=0)
+
+    def add_item(self, item: Item) -> None:
+        self._add(("item", item.id), item.name, (item.description,))
+
+    def _add(self, key: DocKey, name: str, texts: Tuple[str, ...], name_weight: int = NAME_WEIGHT) -> None:
+        if key in self._names:
+            return
+        self._names[key] = name
+        self._texts[key] = texts
+
+        counts: Dict[str, int] = {}
+        if name_weight:
+            for tok in tokenize(name):
+                counts[tok] = counts.get(tok, 0) + name_weight
+        for text in texts:
+            for tok in tokenize(text):
+                counts[tok] = counts.get(tok, 0) + 1
+        for tok, tf in counts.items():
+            self.postings.setdefault(tok, {})[key] = tf
+
+    def search(
+        self,
+        query: str,
+        scope: Optional[Mapping[str, Collection[str]]] = None,
+        limit: int = 5,
+    ) -> List[Hit]:
+        """
+        Rank documents containing every query token by tf-idf.
+        `scope` maps kind -> ids allowed (e.g. what a player has seen).
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        lists = [self._postings(tok) for tok in tokens]
+        if any(not p for p in lists):
+            return []
+
+        total = len(self)
+        weighted = sorted(
+            ((plist, math.log(1.0 + total / len(plist))) for plist in lists),  # type: ignore[arg-type]
+            key=lambda pw: len(pw[0]),
+        )
+        rarest = weighted[0][0]
+
+        # walk whichever is shorter, the rarest posting list or the scope,
+        # and probe the rest
+        allowed = scope
+        if scope is not None and sum(len(refs) for refs in scope.values()) < len(rarest):
+            docs = (self._doc(kind, ref) for kind, refs in scope.items() for ref in refs)
+            candidates: Iterable[Any] = [doc for doc in docs if doc is not None]
+            allowed = None
+        else:
+            candidates = rarest
+
+        scored: List[Tuple[float, str, Any, Any]] = []
+        for doc in candidates:
+            if allowed is not None:
+                kind, ref = self._key(doc)
+                if ref not in allowed.get(kind, ()):
+                    continue
+            score = 0.0
+            for plist, idf in weighted:
+                tf = plist.get(doc)
+                if tf is None:
+                    break
+                score -= tf * idf
+            else:
+                scored.append((score, self._name(doc), self._order(doc), doc))
+
+        # a room may score twice (description and detail), so keep spares
+        best = heapq.nsmallest(2 * limit, scored)
+        hits: List[Hit] = []
+        rooms_hit = set()
+        for score, name, _, doc in best:
+            kind, ref = self._key(doc)
+            if kind != "item":
+                # a room's description and detail report as one room hit
+                if ref in rooms_hit:
+                    continue
+                rooms_hit.add(ref)
+                kind = "room"
+            hits.append(Hit(kind=kind, id=ref, name=name, snippet=snippet(self._doc_texts(doc), tokens), score=-score))
+            if len(hits) == limit:
+                break
+        return hits
+
+    # -------------------------
+    # Document access; a compiled index (game.shared_world) numbers its
+    # documents instead of keying them by DocKey
+    # -------------------------
+
+    def _postings(self, token: str) -> Optional[Mapping[Any, int]]:
+        return self.postings.get(token)
+
+    def _doc(self, kind: str, ref: str) -> Optional[Any]:
+        return (kind, ref)
+
+    def _key(self, doc: Any) -> DocKey:
+        return doc
+
+    def _order(self, doc: Any) -> Any:
+        # ties go to descriptions before details before items
+        return _KIND_ORDER[doc[0]], doc[1]
+
+    def _name(self, doc: Any) -> str:
+        return self._names[doc]
+
+    def _doc_texts(self, doc: Any) -> Tuple[str, ...]:
+        return self._texts[doc]
+
+
+def snippet(texts: Iterable[str], tokens: List[str]) -> str:
+    """
+    First sentence of `texts` containing one of the query tokens.
+    """
+    for text in texts:
+        for sentence in _SENTENCE_RE.split(" ".join(text.split())):
+            if any(tok in tokenize(sentence) for tok in tokens):
+                return sentence
+    return ""
@@ -1,6 +1,6 @@
 # game/world.py
 from dataclasses import dataclass, field
-from typing import Dict, Set, Optional, List
+from typing import Callable, Dict, Iterable, Iterator, Set, Optional, List, Tuple
 
 from .entities import Item
 
@@ -11,14 +11,25 @@ class Location:
     name: str
     description: str
     detail_description: str = ""
+    region: str = ""
     neighbors: Set[str] = field(default_factory=set)
     items: List[Item] = field(default_factory=list)
+    # bumped whenever exits or items change; render caches key on it
+    version: int = field(default=0, compare=False)
 
     def add_neighbor(self, neighbor_id: str) -> None:
         self.neighbors.add(neighbor_id)
+        self.version += 1
 
     def place_item(self, item: Item) -> None:
         self.items.append(item)
+        self.version += 1
+
+    def take_items(self) -> List[Item]:
+        taken = list(self.items)
+        self.items.clear()
+        self.version += 1
+        return taken
 
 
 class World:
@@ -38,3 +49,36 @@ class World:
     def get_location(self, location_id: str) -> Optional[Location]:
         return self.locations.get(location_id)
 
+
+    def placed_items(self) -> Iterator[Tuple[str, Item]]:
+        """
+        (room_id, item) for every item lying in a room, room by room.
+        """
+        for loc in self.locations.values():
+            for item in loc.items:
+                yield loc.id, item
+
+    def room_name(self, room_id: str) -> Optional[str]:
+        """
+        Name of a room, without bringing it into memory if it is not.
+        """
+        loc = self.get_location(room_id)
+        return loc.name if loc else None
+
+    def add_load_listener(self, callback: Callable[[List[Location]], None]) -> None:
+        """
+        Register a callback for rooms loaded after setup. A plain World is
+        loaded in full up front, so it never fires.
+        """
+
+    def ensure_loaded(self, room_ids: Iterable[str] = (), item_ids: Iterable[str] = ()) -> None:
+        """
+        Bring these rooms, and the rooms the scenario places these items
+        in, into memory. A plain World already holds everything.
+        """
+
+    def settle(self, occupied_rooms: Iterable[str]) -> None:
+        """
+        Called after players move. Worlds that load regions on demand use
+        it to page regions in and out; a plain World ignores it.
+        """
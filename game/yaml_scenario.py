@@ -1,14 +1,15 @@
 # game/yaml_scenario.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 
 from .scenario import Scenario
 from .game_state import GameState
 from .world import World, Location
 from .entities import Item
+from .ambient import AliasTable, parse_ambient_table
 
 try:
     import yaml  # type: ignore
@@ -23,6 +24,8 @@ class ScenarioConfig:
     mode: str
     starts: Dict[str, str]
     intro: str
+    # raw scenario.realtime mapping; see game.realtime.RealtimeConfig
+    realtime: Dict[str, Any] = field(default_factory=dict)
 
 
 class YamlScenario(Scenario):
@@ -38,6 +41,10 @@ class YamlScenario(Scenario):
     def __init__(self, scenario_dir: str) -> None:
         self.scenario_dir = Path(scenario_dir)
         self._config: Optional[ScenarioConfig] = None
+        self._ambient: Dict[str, AliasTable] = {}
+        self._default_ambient: Optional[AliasTable] = None
+        # path -> (mtime_ns, parsed doc); lets one instance set up many sessions
+        self._doc_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
 
     @property
     def name(self) -> str:
@@ -46,42 +53,35 @@ class YamlScenario(Scenario):
             return self.scenario_dir.name
         return self._config.name
 
-    def initial_setup(self, state: GameState) -> None:
-        if yaml is None:  # pragma: no cover
-            raise RuntimeError(
-                "PyYAML is not installed. Install it with: pip install pyyaml"
-            ) from _yaml_import_error
-
-        rooms_path = self.scenario_dir / "rooms.yaml"
-        items_path = self.scenario_dir / "items.yaml"
-
-        if not rooms_path.exists():
-            raise FileNotFoundError(f"Missing rooms.yaml: {rooms_path}")
-        if not items_path.exists():
-            raise FileNotFoundError(f"Missing items.yaml: {items_path}")
+    @property
+    def mode(self) -> str:
+        if self._config is None:
+            return "meet"
+        return self._config.mode
 
-        rooms_doc = self._load_yaml(rooms_path)
-        items_doc = self._load_yaml(items_path)
+    @property
+    def realtime(self) -> Dict[str, Any]:
+        if self._config is None:
+            return {}
+        return self._config.realtime
 
-        config = self._parse_config(rooms_doc)
-        world = self._build_world(rooms_doc)
-        self._place_items(world, items_doc)
+    def initial_setup(self, state: GameState) -> None:
+        config, world = self._load()
 
         state.world = world
         self._config = config
 
         # Start positions
-        for pid, player in state.players.items():
+        for pid in state.players:
             start_room = config.starts.get(pid)
             if start_room is None:
                 # if unspecified, fall back to first room id
-                first_room_id = next(iter(world.locations.keys()), "")
-                start_room = first_room_id
+                start_room = self._default_start(world)
             if start_room not in world.locations:
                 raise ValueError(
                     f"Start room '{start_room}' for player '{pid}' does not exist in rooms.yaml"
                 )
-            player.location_id = start_room
+            state.move_player(pid, start_room)
         if config.intro:
             state.add_message(config.intro)
 
@@ -90,6 +90,42 @@ class YamlScenario(Scenario):
         else:
             state.add_message(f"Scenario mode: {config.mode}")
 
+    def _default_start(self, world: World) -> str:
+        """
+        First room in rooms.yaml order.
+        """
+        return next(iter(world.locations.keys()), "")
+
+    def _load(self) -> Tuple[ScenarioConfig, World]:
+        """
+        Parse the scenario files into a config and a fresh World.
+        Subclasses with another source of compiled data override this.
+        """
+        if yaml is None:  # pragma: no cover
+            raise RuntimeError(
+                "PyYAML is not installed. Install it with: pip install pyyaml"
+            ) from _yaml_import_error
+
+        rooms_path = self.scenario_dir / "rooms.yaml"
+        items_path = self.scenario_dir / "items.yaml"
+
+        if not rooms_path.exists():
+            raise FileNotFoundError(f"Missing rooms.yaml: {rooms_path}")
+        if not items_path.exists():
+            raise FileNotFoundError(f"Missing items.yaml: {items_path}")
+
+        rooms_doc = self._load_yaml(rooms_path)
+        items_doc = self._load_yaml(items_path)
+
+        config = self._parse_config(rooms_doc)
+        world = self._build_world(rooms_doc)
+        self._place_items(world, items_doc)
+        self._default_ambient, self._ambient = self._parse_ambient(
+            rooms_doc, ((loc.id, loc.region) for loc in world.locations.values())
+        )
+        self._check_mode(config.mode, world)
+        return config, world
+
     def check_win_condition(self, state: GameState) -> Optional[str]:
         if self._config is None:
             return None
@@ -98,11 +134,7 @@ class YamlScenario(Scenario):
 
         # Default / simplest win condition: both players meet
         if mode == "meet":
-            players = list(state.players.values())
-            if len(players) < 2:
-                return None
-            p1, p2 = players[0], players[1]
-            if p1.location_id == p2.location_id:
+            if state.occupancy.all_together(len(state.players)):
                 return "BOTH"
             return None
 
@@ -110,20 +142,86 @@ class YamlScenario(Scenario):
         # e.g. "reach:<room_id>", "survive:<turns>", etc.
         if mode.startswith("reach:"):
             target = mode.split(":", 1)[1].strip()
-            for p in state.players.values():
-                if p.location_id == target:
-                    return p.id
+            occupants = state.occupancy.occupants(target)
+            if not occupants:
+                return None
+            # deterministic winner if several arrive together
+            for pid in state.turn_order:
+                if pid in occupants:
+                    return pid
+            return next(iter(occupants))
+
+        # collect:<item_id> - whoever holds the item wins
+        if mode.startswith("collect:"):
+            item_id = mode.split(":", 1)[1].strip().lower()
+            return state.items.holder_of(item_id)
+
+        # deliver:<item_id>@<room_id> - the item must end up in the room,
+        # carried there or set down there
+        if mode.startswith("deliver:"):
+            item_id, room_id = _parse_deliver(mode)
+            holder = state.items.where(item_id)
+            if holder is None:
+                return None
+            kind, ref = holder
+            if kind == "room":
+                return "BOTH" if ref == room_id else None
+            if state.occupancy.room_of(ref) == room_id:
+                return ref
             return None
 
         return None
 
+    def win_message(self, winner_id: str) -> str:
+        if self._config is not None and self._config.mode.startswith("deliver:"):
+            # "BOTH" here means the item was set down in the room, not a meeting
+            if winner_id == "BOTH":
+                return "The offering rests where it belongs. Whatever waited here is satisfied."
+            return f"Player {winner_id} has delivered the offering."
+        return super().win_message(winner_id)
+
+    def _check_mode(self, mode: str, world: World) -> None:
+        if mode.startswith("reach:"):
+            target = mode.split(":", 1)[1].strip()
+            if target not in world.locations:
+                raise ValueError(f"rooms.yaml: mode '{mode}' targets unknown room '{target}'")
+            return
+
+        item_id = ""
+        room_id = ""
+        if mode.startswith("collect:"):
+            item_id = mode.split(":", 1)[1].strip().lower()
+        elif mode.startswith("deliver:"):
+            item_id, room_id = _parse_deliver(mode)
+            if room_id not in world.locations:
+                raise ValueError(f"rooms.yaml: mode '{mode}' targets unknown room '{room_id}'")
+        else:
+            return
+
+        placed = {item.id: rid for rid, item in world.placed_items()}
+        if item_id not in placed:
+            raise ValueError(f"rooms.yaml: mode '{mode}' needs item '{item_id}', which items.yaml does not place")
+        if placed[item_id] == room_id:
+            raise ValueError(f"rooms.yaml: mode '{mode}' is won before play; '{item_id}' starts in '{room_id}'")
+
+    def ambient_table(self, room_id: str) -> Optional[AliasTable]:
+        return self._ambient.get(room_id, self._default_ambient)
+
     def _load_yaml(self, path: Path) -> Dict[str, Any]:
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._doc_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
         with path.open("r", encoding="utf-8") as f:
             data = yaml.safe_load(f)  # type: ignore
         if data is None:
-            return {}
+            data = {}
         if not isinstance(data, dict):
             raise ValueError(f"YAML root must be a mapping in {path}")
+        self._doc_cache[path] = (mtime_ns, data)
+        # story text changed (or first load); rebuild the text index lazily
+        self._text_index = None
         return data
 
     def _parse_config(self, rooms_doc: Dict[str, Any]) -> ScenarioConfig:
@@ -145,7 +243,14 @@ class YamlScenario(Scenario):
         starts: Dict[str, str] = {str(k): str(v) for k, v in starts_raw.items()}
 
         intro = str(scen.get("intro", "")).rstrip()
-        return ScenarioConfig(name=name, mode=mode, starts=starts, intro=intro)
+
+        realtime = scen.get("realtime", {})
+        if realtime is None:
+            realtime = {}
+        if not isinstance(realtime, dict):
+            raise ValueError("rooms.yaml: 'scenario.realtime' must be a mapping")
+
+        return ScenarioConfig(name=name, mode=mode, starts=starts, intro=intro, realtime=realtime)
 
     def _build_world(self, rooms_doc: Dict[str, Any]) -> World:
         rooms_raw = rooms_doc.get("rooms", [])
@@ -166,6 +271,7 @@ class YamlScenario(Scenario):
                 name=str(r.get("name", rid)),
                 description=str(r.get("description", "")),
                 detail_description=str(r.get("detail_description", "")),
+                region=str(r.get("region", "") or "").strip().lower(),
             )
             world.add_location(loc)
 
@@ -194,6 +300,48 @@ class YamlScenario(Scenario):
 
         return world
 
+    def _parse_ambient(
+        self, rooms_doc: Dict[str, Any], room_regions: Iterable[Tuple[str, str]]
+    ) -> Tuple[Optional[AliasTable], Dict[str, AliasTable]]:
+        """
+        Compile ambient tables once at load. Lookup order per room:
+        the room's own table, then its region's, then scenario.ambient,
+        then the engine default.
+        """
+        scen = rooms_doc.get("scenario") or {}
+        default: Optional[AliasTable] = None
+        if scen.get("ambient") is not None:
+            default = parse_ambient_table(scen["ambient"], "rooms.yaml: scenario")
+
+        regions_raw = rooms_doc.get("regions", {})
+        if regions_raw is None:
+            regions_raw = {}
+        if not isinstance(regions_raw, dict):
+            raise ValueError("rooms.yaml: 'regions' must be a mapping of region_id -> settings")
+
+        region_tables: Dict[str, AliasTable] = {}
+        for region_id, settings in regions_raw.items():
+            rid = str(region_id).strip().lower()
+            if settings is None:
+                continue
+            if not isinstance(settings, dict):
+                raise ValueError(f"rooms.yaml: region '{rid}' must be a mapping")
+            if settings.get("ambient") is not None:
+                region_tables[rid] = parse_ambient_table(settings["ambient"], f"rooms.yaml: region '{rid}'")
+
+        tables: Dict[str, AliasTable] = {}
+        for room_id, region in room_regions:
+            if region in region_tables:
+                tables[room_id] = region_tables[region]
+
+        for r in rooms_doc.get("rooms", []):
+            if r.get("ambient") is None:
+                continue
+            rid = str(r.get("id", "")).strip().lower()
+            tables[rid] = parse_ambient_table(r["ambient"], f"rooms.yaml: room '{rid}'")
+
+        return default, tables
+
     def _place_items(self, world: World, items_doc: Dict[str, Any]) -> None:
         items_raw = items_doc.get("items", [])
         if not isinstance(items_raw, list):
@@ -226,3 +374,11 @@ class YamlScenario(Scenario):
             item = Item(id=item_id, name=name, description=desc, tags=tags)
             world.locations[loc_id].place_item(item)
 
+
+
+def _parse_deliver(mode: str) -> Tuple[str, str]:
+    body = mode.split(":", 1)[1]
+    if "@" not in body:
+        raise ValueError(f"rooms.yaml: mode '{mode}' must look like deliver:<item_id>@<room_id>")
+    item_id, room_id = body.split("@", 1)
+    return item_id.strip().lower(), room_id.strip().lower()
@@ -1,16 +1,36 @@
 scenario:
   name: "Manor"
-  mode: "meet"   # meet | reach:<room_id>
+  mode: "meet"   # meet | reach:<room_id> | collect:<item_id> | deliver:<item_id>@<room_id>
   intro: |
     You wake up on a cold stone floor. The air stinks of mildew.
     Something is watching from the dark corner you can't quite see.
   starts:
     P1: "foyer"
     P2: "library"
+  # Optional, used only with `--realtime`:
+  # realtime:
+  #   tick: 0.25
+  #   ambient_every: 20        # seconds between ambient rolls per player
+  #   sanity_decay_every: 60   # 0 disables
+  #   timers:
+  #     - after: 120
+  #       message: "A bell tolls somewhere below."
 
 # rooms.yaml is the ONLY runtime story file for rooms + topology.
 # goals.md / notes.md are for humans, not parsed by the engine.
 
+# Optional ambient events. Lookup per room: room `ambient:`, then its
+# `region:` table below, then `scenario.ambient:`, then the engine default.
+# regions:
+#   cellar:
+#     ambient:
+#       - weight: 3
+#         message: "Something drips onto the back of your neck."
+#         sanity: -1
+#         modifiers:
+#           light: { sanity: 1 }   # carrying a light cancels the loss
+#       - weight: 7                # nothing happens
+
 rooms:
   - id: "foyer"
     name: "Foyer"